@@ -4,6 +4,7 @@ from .jinx import Jinx
 from .frame_handler import FrameHandler
 from .gif_maker import GifMaker
 from .sorceress import Sorceress
+from .pipeline import Pipeline
 from .screen_grabber import ScreenGrabber
 
 from . import colors
@@ -0,0 +1,212 @@
+import os
+import numpy as np
+from PIL import Image
+from .jinx import Jinx
+from . import colors
+from . import utils
+
+
+class Pipeline:
+    """
+    Deferred chain of Sorceress effects. Effects are only recorded when called, and then all run at once by
+    render() on a single numpy pixel array, instead of each effect converting the image from Pillow to numpy and
+    back again. Example:
+        sorc.pipeline().neon(offset=50).cleave(angle=30).alpha_border().save()
+    """
+
+    # effects that only change each pixel on its own (no pixel reads another pixel), so consecutive ones are fused
+    # into one pass over the working array (see run_pointwise())
+    pointwise_effects = ('static', 'alpha_border', 'text')
+
+    def __init__(self, sorceress):
+        self.sorceress = sorceress
+        self.steps = []  # list of (effect name, kwargs)
+        # Sorceress that effect() steps run on, made on first use and reused by every step and render
+        self._effect_sorc = None
+        return
+
+    def add_step(self, name, kwargs):
+        self.steps.append((name, kwargs))
+        return self
+
+    def static(self, **kwargs):
+        """See Sorceress.static()."""
+        return self.add_step('static', kwargs)
+
+    def cleave(self, **kwargs):
+        """See Sorceress.cleave()."""
+        return self.add_step('cleave', kwargs)
+
+    def neon(self, **kwargs):
+        """See Sorceress.neon()."""
+        return self.add_step('neon', kwargs)
+
+    def alpha_border(self, **kwargs):
+        """See Sorceress.alpha_border()."""
+        return self.add_step('alpha_border', kwargs)
+
+    def text(self, text='TEXT', size=12, loc=(0, 0), font_path='', color=colors.WHITE):
+        """See Sorceress.text(). Text is pasted as a cached text sprite (see utils.text_sprite)."""
+        return self.add_step('text', dict(text=text, loc=loc, size=size, font_path=font_path, color=color))
+
+    def effect(self, name, **kwargs):
+        """
+        Any other Sorceress effect, by method name. The pipeline has to hand it a Pillow image, so this costs a
+        conversion to Pillow and back (on one Sorceress kept for all such steps).
+        """
+        return self.add_step(name, kwargs)
+
+    def fused_steps(self):
+        """
+        Group the recorded steps: each run of consecutive pointwise steps becomes one group that runs in a single
+        pass (see run_pointwise()), every other step is a group of its own. Within a pointwise group only the last alpha_border is kept, since each one
+        replaces the whole alpha channel and nothing else in the group reads it.
+        :return: list of (is pointwise, list of steps)
+        """
+        groups = []
+        for step in self.steps:
+            is_pointwise = step[0] in self.pointwise_effects
+            if is_pointwise and groups and groups[-1][0]:
+                groups[-1][1].append(step)
+            else:
+                groups.append((is_pointwise, [step]))
+        for is_pointwise, group_steps in groups:
+            if not is_pointwise:
+                continue
+            alpha_ixs = [i for i, (name, _) in enumerate(group_steps) if name == 'alpha_border']
+            for i in reversed(alpha_ixs[:-1]):
+                del group_steps[i]
+        return groups
+
+    def render_array(self):
+        """
+        Run all recorded steps on the Sorceress' current image. With the Pillow backend this works on a new array;
+        with the array backend pointwise steps change the Sorceress' array in place.
+        :return: uint8 pixel array
+        """
+        sorc = self.sorceress
+        if sorc.backend == 'array':
+            arr = sorc.arr
+        else:
+            img = sorc.img
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGB')
+            arr = np.array(img)
+        # second buffer for effects that can't run in place, swapped with arr after each one
+        scratch = None
+        for is_pointwise, group_steps in self.fused_steps():
+            if is_pointwise:
+                arr = self.run_pointwise(arr, group_steps)
+                continue
+            for name, kwargs in group_steps:
+                if name == 'cleave':
+                    if scratch is None or scratch.shape != arr.shape:
+                        scratch = np.empty_like(arr)
+                    np.copyto(scratch, arr)
+                    xs = np.arange(arr.shape[0])[:, np.newaxis]
+                    ys = np.arange(arr.shape[1])[np.newaxis, :]
+                    sorc._cleave_array(
+                        arr, scratch, xs, ys,
+                        kwargs.get('center_point', (0, 0)),
+                        kwargs.get('move_chunk', 0),
+                        kwargs.get('pixel_shift', 100),
+                        kwargs.get('angle', 0)
+                    )
+                    arr, scratch = scratch, arr
+                elif name == 'neon':
+                    kwargs = {k: v for k, v in kwargs.items() if k != 'blur_radius'}
+                    out = None
+                    if scratch is not None and scratch.shape == arr.shape[:2] + (3,):
+                        out = scratch
+                    arr, scratch = sorc._neon_array(arr, out=out, **kwargs), arr
+                else:
+                    # not an array effect, run it on a Pillow image
+                    if self._effect_sorc is None:
+                        self._effect_sorc = sorc.__class__(img=Image.fromarray(arr))
+                    else:
+                        self._effect_sorc.img = Image.fromarray(arr)
+                    getattr(self._effect_sorc, name)(**kwargs)
+                    arr = np.array(self._effect_sorc.img)
+        return arr
+
+    def run_pointwise(self, arr, group_steps):
+        """
+        Run a group of pointwise steps from fused_steps() in one pass over arr, with the same result as running them
+        one after another:
+            - the (one remaining) alpha_border sets the alpha channel first, since nothing else in the group reads it
+            - static steps don't paint the image, they only mark each spawned pixel's color in one palette index map
+              (later static steps overwriting earlier ones)
+            - text is blended straight onto arr, but only after painting the static marked so far under the sprite
+            - the static still marked is painted with one masked write at the end
+        :return: uint8 pixel array, arr itself unless alpha_border had to add an alpha channel
+        """
+        sorc = self.sorceress
+        for name, kwargs in group_steps:
+            if name == 'alpha_border':
+                arr = sorc._alpha_border_array(arr, **kwargs)
+        # palettes of the static steps stacked together, index 0 meaning "no static here"
+        palettes = [np.zeros((1, 3), dtype=np.uint8)]
+        n_palette_colors = 1
+        color_ixs = None
+        for name, kwargs in group_steps:
+            if name == 'static':
+                spawn_mask, palette, palette_ixs = sorc._static_draw(arr.shape[:2], **kwargs)
+                if color_ixs is None:
+                    color_ixs = np.zeros(arr.shape[:2], dtype=np.int32)
+                color_ixs[spawn_mask] = palette_ixs + n_palette_colors
+                palettes.append(palette)
+                n_palette_colors += len(palette)
+            elif name == 'text':
+                sprite, sprite_loc = self.text_sprite(**kwargs)
+                if color_ixs is not None:
+                    col, row = sprite_loc
+                    rows = slice(max(row, 0), max(row + sprite.size[1], 0))
+                    cols = slice(max(col, 0), max(col + sprite.size[0], 0))
+                    self.paint_static(arr[rows, cols], color_ixs[rows, cols], np.concatenate(palettes))
+                utils.paste_sprite_array(arr, sprite, sprite_loc)
+        if color_ixs is not None:
+            self.paint_static(arr, color_ixs, np.concatenate(palettes))
+        return arr
+
+    @staticmethod
+    def paint_static(arr, color_ixs, palette):
+        """
+        Paint the static marked in color_ixs (indices into palette, 0 for none) onto the color channels of arr, and
+        clear the marks (both arrays may be views of a region).
+        :return:
+        """
+        spawned = color_ixs > 0
+        arr[..., :3][spawned] = palette[color_ixs[spawned]]
+        color_ixs[spawned] = 0
+        return
+
+    @staticmethod
+    def text_sprite(text='TEXT', size=12, loc=(0, 0), font_path='', color=colors.WHITE):
+        """
+        Get the (cached) sprite of a text step, and where to paste it.
+        :return: RGBA Pillow image, (x, y) Pillow coordinates of its top left corner
+        """
+        # set default font
+        if font_path == '':
+            font_path = os.path.join(Jinx.fonts_folder, 'ClearSans-Regular.ttf')
+        sprite, sprite_offset = utils.text_sprite(text, font_path, size, tuple(color))
+        return sprite, (loc[0] + sprite_offset[0], loc[1] + sprite_offset[1])
+
+    def render(self):
+        """
+        Run all recorded steps and set the result as the Sorceress' image (with the array backend, Pillow isn't
+        involved until the image is saved). The steps are kept, so the same pipeline
+        can be rendered again, i.e. once per frame after reload().
+        :return: the Sorceress
+        """
+        arr = self.render_array()
+        self.sorceress.set_array(arr)
+        return self.sorceress
+
+    def save(self):
+        self.render().save()
+        return
+
+    def save_frame(self):
+        self.render().save_frame()
+        return
@@ -1,5 +1,7 @@
 import os
 import math
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter, ImageChops, ImageDraw, ImageFont
 import random
@@ -8,19 +10,62 @@ from shapely import ops
 import warnings
 from .frame_handler import FrameHandler
 from .jinx import Jinx
+from .pipeline import Pipeline
 from . import axioms
 from . import colors
 from . import easings
 from . import utils
 
 
+# source image of a Sorceress.sweep(), set once in each worker process
+_sweep_source = None
+
+
+def _init_sweep_worker(sorceress_class, source_arr, backend):
+    global _sweep_source
+    _sweep_source = (sorceress_class, source_arr, backend)
+    return
+
+
+def _sweep_frame(fn, frame_n, param, seed):
+    """
+    Render one frame of a Sorceress.sweep() on a fresh Sorceress of the source image.
+    :return: frame_n, pixel array of the frame
+    """
+    sorceress_class, source_arr, backend = _sweep_source
+    random.seed(seed)
+    np.random.seed(seed)
+    sorc = sorceress_class(img=utils.array_to_img_auto(source_arr), backend=backend)
+    fn(sorc, param, seed)
+    return frame_n, sorc.arr
+
+
 class Sorceress(Jinx):
 
     def __init__(
             self,
             img_path='',
             img=None,
-            out_path=''):
+            out_path='',
+            backend='pil'):
+        """
+        :param img_path: path of image to load
+        :param img: or, a Pillow image to use
+        :param out_path: path to save the altered image to
+        :param backend: 'pil' to keep the image as a Pillow image (default), or 'array' to keep it as a contiguous
+            uint8 numpy array (sorc.arr) that numpy-based effects change in place. With the array backend, sorc.img is
+            a Pillow copy of the array made only when something needs it (Pillow filters, saving); changes made to
+            that copy directly are not seen by the array, so set sorc.img to the changed image instead.
+        """
+        if backend not in ['pil', 'array']:
+            raise Exception("Error: unable to understand backend, was expecting 'pil' or 'array'.")
+        self.backend = backend
+        self._img = None
+        self._arr = None
+        # spare buffer effects can write into instead of allocating a new array each time
+        self._scratch = None
+        # view of another Sorceress' pixels that this one's image is written into, see region()
+        self._view = None
         # handle image paths
         self.img_path = img_path
         self.out_path = self.get_out_path(out_path, ext='png')
@@ -31,12 +76,243 @@ class Sorceress(Jinx):
             self.img = Image.open(self.img_path)
         else:
             self.img = img
+            # the caller still has this Pillow image, see _img_shared
+            self._img_shared = img is not None
         # set up frame handler for saving individual frames
         self.frame_handler = FrameHandler(out_path=self.out_path)
+        # (pixel key, thickened edges) of the last image neon() found edges on
+        self._neon_edge_cache = None
+        # in-memory checkpoints: the last snapshot(), and a copy of the original image for reload() (with the array
+        # backend, a copy of the pixel array, so reloading is a buffer copy)
+        self._snapshot = None
+        self._original = None
+        if self._img is not None:
+            self._original = self.arr.copy() if self.backend == 'array' else self._img.copy()
+        return
+
+    @property
+    def img(self):
+        # with the array backend, only make the Pillow image once it's asked for
+        if self._img is None and self._arr is not None:
+            self._img = utils.array_to_img_auto(self._arr)
+        return self._img
+
+    @img.setter
+    def img(self, img):
+        # inside region(), effects that work on the Pillow image write it back into the view
+        if self._view is not None:
+            self._set_view(self._img_to_array(img))
+            return
+        self._img = img
+        self._arr = None
+        # whether the Pillow image is also held elsewhere (a snapshot, or the image this Sorceress was made with), so
+        # it must not be drawn on in place
+        self._img_shared = False
+        return
+
+    @property
+    def arr(self):
+        """
+        The image as a uint8 RGB or RGBA numpy array (images in any other mode are converted to RGB). With the array
+        backend this is the image itself; with the Pillow backend it is a new array from the Pillow image.
+        """
+        if self.backend == 'pil':
+            return self._img_to_array(self._img)
+        if self._arr is None and self._img is not None:
+            self._arr = self._img_to_array(self._img)
+        return self._arr
+
+    @staticmethod
+    def _img_to_array(img):
+        """
+        Convert a Pillow image to a contiguous uint8 RGB or RGBA array, the same way for both backends.
+        :return: pixel array
+        """
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGB')
+        return np.ascontiguousarray(np.array(img), dtype=np.uint8)
+
+    @arr.setter
+    def arr(self, arr):
+        self.set_array(arr)
+        return
+
+    def get_array(self):
+        """
+        Get the pixel array of the current image for an effect to work on, like utils.array_from_img(). With the array
+        backend this is the image's own array (no copy); with the Pillow backend it is a new array.
+        :return: pixel array, width, height, n colors
+        """
+        if self.backend == 'array':
+            arr = self.arr
+            image_colors = arr.shape[2] if arr.ndim == 3 else None
+            return arr, arr.shape[0], arr.shape[1], image_colors
+        return utils.array_from_img(self.img)
+
+    def set_array(self, arr):
+        """
+        Set the current image from a pixel array. With the array backend the array becomes the image itself (and any
+        Pillow copy is dropped); with the Pillow backend it is converted to a Pillow image.
+        :return:
+        """
+        if self.backend == 'array' and self._view is not None:
+            self._set_view(arr)
+        elif self.backend == 'array':
+            self._arr = np.ascontiguousarray(arr, dtype=np.uint8)
+            self._img = None
+        else:
+            self.img = utils.array_to_img_auto(arr)
+        return
+
+    def _set_view(self, arr):
+        """
+        Copy a pixel array into the view this Sorceress works on inside region(), converting it to the view's number
+        of channels if an effect changed them.
+        :return:
+        """
+        view = self._view
+        if arr is not view:
+            if arr.shape[:2] != view.shape[:2]:
+                raise Exception("Error: effects inside a region can't change the size of the region.")
+            if arr.shape != view.shape:
+                arr = np.array(utils.array_to_img_auto(arr).convert('RGBA' if view.shape[2] == 4 else 'RGB'))
+            np.copyto(view, arr)
+        self._arr = view
+        self._img = None
+        return
+
+    def get_scratch(self, im):
+        """
+        Get a spare array with the same shape as im to write an effect's output into, reused between effects.
+        :return: uint8 array, not sharing memory with im
+        """
+        if self._scratch is None or self._scratch.shape != im.shape or np.shares_memory(self._scratch, im):
+            self._scratch = np.empty(im.shape, dtype=np.uint8)
+        return self._scratch
+
+    def swap_scratch(self, new, old):
+        """
+        Set the effect output new (from get_scratch()) as the current image, and keep the old pixel array as the next
+        scratch buffer if it is no longer the image.
+        :return:
+        """
+        self.set_array(new)
+        # inside region() new is copied into the view, which stays the image
+        self._scratch = old if self.backend == 'array' and self._arr is not old else new
+        return
+
+    def sweep(self,
+              fn,
+              params,
+              workers=None,
+              seed=0):
+        """
+        Render one frame per parameter over a pool of processes, and save the frames with save_frame() in the same
+        order as params (even though frames may finish out of order). Each frame starts from the current image, so
+        this replaces the loop of: apply effects, save_frame(), reload().
+        :param fn: function fn(sorc, param, seed) that applies effects to sorc, a fresh Sorceress of the current image.
+            It must be picklable, i.e. a function defined at the top level of a module, and scripts using sweep()
+            should guard their code with if __name__ == '__main__'.
+            Example:
+                def cleave_frame(sorc, angle, seed):
+                    sorc.static(seed=seed)
+                    sorc.cleave(angle=angle)
+        :param params: list of parameters, one frame per parameter
+        :param workers: number of processes; defaults to the number of CPUs. If 1, frames are rendered in this process,
+            and the random modules' state is put back afterwards, as if the frames had run in other processes
+        :param seed: base seed; frame n is rendered with seed + n, which also seeds the random and np.random modules
+            before fn is called, so a sweep renders the same frames every time
+        :return:
+        """
+        params = list(params)
+        source_arr = self.arr
+        if workers == 1:
+            _init_sweep_worker(self.__class__, source_arr, self.backend)
+            # frames reseed the global random and np.random modules, so put the caller's random state back after
+            random_state, np_random_state = random.getstate(), np.random.get_state()
+            try:
+                for frame_n, param in enumerate(params):
+                    _, frame_arr = _sweep_frame(fn, frame_n, param, seed + frame_n)
+                    self.save_frame(utils.array_to_img_auto(frame_arr))
+            finally:
+                random.setstate(random_state)
+                np.random.set_state(np_random_state)
+            return
+        # frames that finished before the frames ahead of them, by frame number
+        finished_frames = {}
+        next_frame_n = 0
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_sweep_worker,
+                initargs=(self.__class__, source_arr, self.backend)) as executor:
+            futures = [
+                executor.submit(_sweep_frame, fn, frame_n, param, seed + frame_n)
+                for frame_n, param in enumerate(params)
+            ]
+            for future in as_completed(futures):
+                frame_n, frame_arr = future.result()
+                finished_frames[frame_n] = frame_arr
+                # save every frame that is now next in line
+                while next_frame_n in finished_frames:
+                    self.save_frame(utils.array_to_img_auto(finished_frames.pop(next_frame_n)))
+                    next_frame_n += 1
+        return
+
+    def snapshot(self):
+        """
+        Keep the current image in memory, to go back to later with restore() (i.e. once per frame) instead of reading
+        and decoding the image file again. With the Pillow backend the snapshot is the current Pillow image itself,
+        which is free to take since effects make a new image rather than drawing on the current one; so if you draw
+        on sorc.img in place (i.e. with ImageDraw.Draw(sorc.img)), set sorc.img = sorc.img.copy() first or the
+        snapshot changes too. With the array backend it is a copy of the pixel array.
+        :return: the snapshot, which can also be passed to restore() later
+        """
+        if self.backend == 'array':
+            snapshot = self.arr.copy()
+        else:
+            snapshot = self.img
+            self._img_shared = True
+        self._snapshot = snapshot
+        return snapshot
+
+    def restore(self, snapshot=None):
+        """
+        Go back to a snapshot of the image. With the Pillow backend the snapshot becomes the current image again (no
+        copy), with the array backend its pixels are copied into the current array's buffer.
+        :param snapshot: a snapshot returned by snapshot(); defaults to the last one taken
+        :return:
+        """
+        if snapshot is None:
+            snapshot = self._snapshot
+        if snapshot is None:
+            raise Exception("Error: no snapshot to restore, call snapshot() first.")
+        if isinstance(snapshot, Image.Image):
+            self.img = snapshot
+            self._img_shared = True
+        elif self.backend == 'pil':
+            self.img = utils.array_to_img_auto(snapshot)
+        elif self._arr is not None and self._arr.shape == snapshot.shape and not np.shares_memory(self._arr, snapshot):
+            # write over the current array instead of allocating a new one
+            np.copyto(self._arr, snapshot)
+            self._img = None
+        else:
+            self.set_array(snapshot.copy())
         return
 
     def reload(self):
-        self.img = Image.open(self.img_path)
+        """
+        Go back to the original image this Sorceress was made with, from memory (see restore()), so it works the same
+        for images loaded from img_path or given as img. With the Pillow backend the current image becomes a copy of
+        the original, so drawing on sorc.img in place can't change the original; with the array backend the original
+        pixels are copied into the current array's buffer.
+        :return:
+        """
+        if self._original is None:
+            raise Exception("Error: no original image to reload.")
+        if self.backend == 'pil':
+            self.img = self._original.copy()
+        else:
+            self.restore(self._original)
         return
 
     def show(self):
@@ -59,6 +335,76 @@ class Sorceress(Jinx):
         self.frame_handler.save_frame(img)
         return
 
+    def pipeline(self):
+        """
+        Start a deferred chain of effects on this Sorceress that all run on one pixel array when rendered, i.e.:
+            sorc.pipeline().neon().cleave(angle=30).alpha_border().save()
+        See jinx.Pipeline.
+        :return: Pipeline
+        """
+        return Pipeline(self)
+
+    @contextmanager
+    def region(self, rect=None):
+        """
+        Apply effects only inside a rectangle of the image, i.e.:
+            with sorc.region((100, 50, 300, 250)) as sub:
+                sub.kuwahara()
+                sub.swirl(strength=3)
+        sub is a Sorceress (array backend) whose array is a view of just the region, so its effects only cost as much
+        as the region is big. Effects that make a new array or Pillow image have it copied into the view (see
+        set_array() and the img setter), so every effect works on the region itself. sub.reload() goes back to the region as it was when the with block started.
+        With the array backend the view is of this Sorceress' own array, so each effect lands in the image as it runs,
+        and if the with block raises, the effects before the error stay applied. With the Pillow backend the view is
+        of a crop of the region, pasted back only if the with block finishes without raising: in place, so it too
+        only costs as much as the region is big, unless the image is a snapshot or the Pillow image this Sorceress was
+        made with, which it is pasted onto a copy of instead so they stay intact.
+        :param rect: (x0, y0, x1, y1) array index bounds of the region (x is the row), x1 and y1 not included;
+            clipped to the image, defaults to the whole image
+        :return: Sorceress of the region
+        """
+        rows, cols = self._rect_slices(self.arr.shape if self.backend == 'array' else self.img.size[::-1], rect)
+        if self.backend == 'array':
+            view = self.arr[rows, cols]
+        else:
+            box = (cols.start, rows.start, cols.stop, rows.stop)
+            view = self._img_to_array(self.img.crop(box))
+        sub = self.__class__(backend='array')
+        sub._view = view
+        # bypass set_array(), which would make a contiguous copy of the view
+        sub._arr = view
+        sub._original = view.copy()
+        try:
+            yield sub
+        finally:
+            # let go of the view, so sub can't change this image after the with block
+            sub._view = None
+            sub.set_array(view.copy())
+            if self.backend == 'array':
+                # any Pillow copy of the image is out of date
+                self._img = None
+        if self.backend == 'pil':
+            new_img = self.img.copy() if self._img_shared else self.img
+            new_img.paste(utils.array_to_img_auto(view).convert(new_img.mode), box)
+            self.img = new_img
+        return
+
+    @staticmethod
+    def _rect_slices(shape, rect):
+        """
+        Turn rect into the row and column slices of the region, clipped to an image of shape (width, height, ...).
+        See region().
+        :return: row slice, column slice
+        """
+        if rect is None:
+            rect = (0, 0, shape[0], shape[1])
+        x0, y0, x1, y1 = (int(round(v)) for v in rect)
+        x0, x1 = min(max(x0, 0), shape[0]), min(max(x1, 0), shape[0])
+        y0, y1 = min(max(y0, 0), shape[1]), min(max(y1, 0), shape[1])
+        if x1 <= x0 or y1 <= y0:
+            raise Exception("Error: rect is empty or outside of the image.")
+        return slice(x0, x1), slice(y0, y1)
+
     def get_grayscale(self, mode="L"):
         # change Pillow image mode to Grayscale (L)
         return self.img.convert(mode)
@@ -83,78 +429,100 @@ class Sorceress(Jinx):
 
     def alpha_border(self,
                      border_radius=10,  # blurred border radius in pixels
-                     gradient_easing=easings.ease_out_linear
+                     gradient_easing=easings.ease_out_linear,
+                     r_min_fraction=1. / 3,  # fully opaque within this fraction of the corner radius
+                     r_max_fraction=0.8  # fully transparent past this fraction of the corner radius
                      ):
         """
         Add more alpha closer to the border of an image radially to give blurred border effect.
+        The finished alpha masks are kept in a bounded LRU cache (see utils.radial_alpha_mask), so feathering
+        same-sized images again only costs setting the alpha channel. Inspect the cache with
+        jinx.utils.radial_alpha_mask.cache_info() and empty it with jinx.utils.radial_alpha_mask.cache_clear().
         :return:
         Ref: https://stackoverflow.com/questions/34654824/feathered-edges-on-image-with-pil
         """
-        # get numpy array of img
-        img = self.img
-        new = np.array(img.convert('RGB'))
-        # print(new.shape)
-
+        if self.backend == 'array':
+            self.set_array(self._alpha_border_array(self.arr, gradient_easing, r_min_fraction, r_max_fraction))
+            return
+        img = self.img.convert('RGB')
         # radially make edges more transparent
-        l_row, l_col, nb_channel = new.shape
-        rows, cols = np.mgrid[:l_row, :l_col]
-        radius = np.sqrt((rows - l_row / 2) ** 2 + (cols - l_col / 2) ** 2)
-        alpha_channel = np.zeros((l_row, l_col))
-        r_min, r_max = 1. / 3 * radius.max(), 0.8 * radius.max()
-        alpha_channel[radius < r_min] = 1
-        alpha_channel[radius > r_max] = 0
-        gradient_zone = np.logical_and(radius >= r_min, radius <= r_max)
-        alpha_channel[gradient_zone] = gradient_easing((r_max - radius[gradient_zone]) / (r_max - r_min))
-        alpha_channel *= 255
-        feathered = np.empty((l_row, l_col, nb_channel + 1), dtype=np.uint8)
-        feathered[..., :3] = new[:]
-        feathered[..., -1] = alpha_channel[:]
-
-        # convert feathered set to the new image
-        self.img = utils.array_to_img_rgba(feathered)
+        l_col, l_row = img.size
+        alpha_channel = utils.radial_alpha_mask((l_row, l_col), r_min_fraction, r_max_fraction, gradient_easing)
+        # set the alpha channel to get the feathered image
+        img.putalpha(Image.fromarray(alpha_channel, 'L'))
+        self.img = img
         return
 
+    @staticmethod
+    def _alpha_border_array(im,
+                            gradient_easing=easings.ease_out_linear,
+                            r_min_fraction=1. / 3,
+                            r_max_fraction=0.8):
+        """
+        Alpha border on the pixel array im. See alpha_border() for parameters.
+        :return: uint8 RGBA array; im itself (alpha set in place) if it already has an alpha channel
+        """
+        alpha_channel = utils.radial_alpha_mask(im.shape[:2], r_min_fraction, r_max_fraction, gradient_easing)
+        if im.ndim == 3 and im.shape[2] == 4:
+            im[..., 3] = alpha_channel
+            return im
+        feathered = np.empty((im.shape[0], im.shape[1], 4), dtype=np.uint8)
+        feathered[..., :3] = im[..., :3] if im.ndim == 3 else im[..., np.newaxis]
+        feathered[..., 3] = alpha_channel
+        return feathered
+
     def static(self,
                amount=0.10,  # static spawn chance
                pixel_colors=None,  # assuming even chance between colors
-               n_fuzzies=0  # ex: value of 2 means 2 colors interpolated between each given color
+               n_fuzzies=0,  # ex: value of 2 means 2 colors interpolated between each given color
+               seed=None  # seed the random generator to reproduce the same static
                ):
         """
         Make image static-y.
+        :param amount: chance (0 to 1) of each pixel being replaced by a static color
+        :param pixel_colors: list of [R, G, B] colors to pick static from
+        :param n_fuzzies: number of colors to interpolate between each pair of given colors
+        :param seed: seed for numpy's random Generator; the same seed on the same image gives the same
+            static
+        :return:
+        """
+        im, width, height, _ = self.get_array()
+        im = self._static_array(im, amount, pixel_colors, n_fuzzies, seed)
+        # set back onto this instance (in place with the array backend)
+        self.set_array(im)
+        return
+
+    @staticmethod
+    def _static_array(im, amount=0.10, pixel_colors=None, n_fuzzies=0, seed=None):
+        """
+        Apply static to the pixel array im in place. See static() for parameters.
+        :return: im
+        """
+        spawn_mask, palette, palette_ixs = Sorceress._static_draw(im.shape[:2], amount, pixel_colors, n_fuzzies, seed)
+        # only paint the color channels, leave any alpha channel alone
+        im[spawn_mask, :3] = palette[palette_ixs]
+        return im
+
+    @staticmethod
+    def _static_draw(shape, amount=0.10, pixel_colors=None, n_fuzzies=0, seed=None):
+        """
+        Pick which pixels of an image of shape (width, height) go static, and their colors. See static() for
+        parameters.
+        :return: boolean spawn mask of shape, uint8 palette (n colors, 3), palette index of each spawned pixel
         """
         if pixel_colors is None:
             pixel_colors = [colors.WHITE, colors.BLACK]
+        rng = np.random.default_rng(seed)
 
-        im, width, height, _ = utils.array_from_img(self.img)
-
-        # if n_fuzzies given, interpolate a bunch of colors between given colors
-        # to append to color list. Number of interpolated points determined by fuzzy_blending
-        if n_fuzzies > 0:
-            given_colors = pixel_colors.copy()
-            for ix, gc in enumerate(given_colors):
-                if ix+1 != len(given_colors):
-                    gc_next = given_colors[ix+1]
-                    color_rng = np.array(gc_next) - np.array(gc)
-                    color_delta = color_rng//n_fuzzies
-                    for _ in range(n_fuzzies):
-                        fuzzy_color = gc + color_delta
-                        fuzzy_color = list(fuzzy_color)
-                        pixel_colors.append(fuzzy_color)
-        # remove duplicates (list type is unhashable; convert to tuple then back to list)
-        pixel_colors = list(set(map(tuple, pixel_colors)))
-        pixel_colors = list(map(list, pixel_colors))
+        # build the palette table once
+        palette = utils.color_palette(pixel_colors, n_fuzzies=n_fuzzies)
         # debug
-        # print([p for p in pixel_colors])
-        # give each pixel chance of going rogue
-        for x in range(width):
-            for y in range(height):
-                coin_toss = random.uniform(0, 1)
-                if coin_toss < amount:
-                    im[x][y] = random.choice(pixel_colors)
-        # convert back to PIL img and set
-        im = utils.array_to_img(im)
-        self.img = im
-        return
+        # print(palette)
+        # give each pixel chance of going rogue: one spawn mask for the whole image, then pick a
+        # palette index for every pixel that spawned static
+        spawn_mask = rng.random(shape) < amount
+        palette_ixs = rng.integers(0, len(palette), size=np.count_nonzero(spawn_mask))
+        return spawn_mask, palette, palette_ixs
 
     def wave(self,
              n_chunks=13,
@@ -170,16 +538,35 @@ class Sorceress(Jinx):
 
         # width, height = self.img.size
         # print(self.img.size)
-        im, width, height, _ = utils.array_from_img(self.img)
-        # new = im.copy()
+        im, width, height, _ = self.get_array()
 
         chunkpoints = np.linspace(0, width, num=n_chunks+1)
-        chunkpoints = [int(cp) for cp in chunkpoints]
-        chunk_x_min_maxs = []
-        for i, cp in enumerate(chunkpoints):
-            if i != 0:
-                chunk_x_min_maxs.append((chunkpoints[i-1], cp))
-        # print(chunk_x_min_maxs)
+        chunkpoints = np.array([int(cp) for cp in chunkpoints])
+
+        # offset table: how many pixels each chunk is shifted in each frame, from one vectorized easing call
+        frame_ns = np.arange(n_frames)[:, np.newaxis]
+        chunk_ns = np.arange(n_chunks)[np.newaxis, :]
+        chunk_es = utils.eval_easing(easing, (frame_ns - chunk_ns) / n_frames)
+        chunk_es = np.clip(chunk_es, 0, 1)
+        chunk_shifts = (chunk_es * max_chunk_delta).astype(int)
+        # print(chunk_shifts)
+
+        # which chunk each pixel row (axis=1) or column (axis=0) belongs to, and an extra "chunk" with no shift
+        # for any pixels past the last chunk
+        n_lines = im.shape[1 - axis]
+        line_chunk_ns = np.searchsorted(chunkpoints, np.arange(n_lines), side='right') - 1
+        line_chunk_ns[line_chunk_ns >= n_chunks] = n_chunks
+        chunk_shifts = np.hstack([chunk_shifts, np.zeros((n_frames, 1), dtype=int)])
+
+        # set up the gather: each output pixel reads the flat pixel index of the input pixel it was rolled from.
+        # Index and output buffers are allocated once and reused every frame.
+        n_colors = im.shape[2] if im.ndim == 3 else 1
+        im_flat = im.reshape(width * height, n_colors)
+        rows = np.arange(width)[:, np.newaxis]
+        cols = np.arange(height)[np.newaxis, :]
+        ixs = np.empty((width, height), dtype=np.intp)
+        new = np.empty_like(im)
+        new_flat = new.reshape(width, height, n_colors)
 
         # if include_original, save the first frame as unaltered image without wave effect
         if include_original:
@@ -187,29 +574,21 @@ class Sorceress(Jinx):
 
         # generate frames
         for frame_n in range(n_frames):
-            # start from new array each frame
-            new = im.copy()
-            # update position of each chunk
-            for chunk_n, chunk_x_min_max in enumerate(chunk_x_min_maxs):
-                x_left, x_right = chunk_x_min_max
-                new_e = easing((frame_n - chunk_n) / n_frames)
-                new_e = utils.clamp(new_e, 0, 1)
-                chunk_shift_y = int(new_e * max_chunk_delta)
-                # print(chunk_n, x_left, x_right, new_e, chunk_shift_y)
-                if axis == 1:
-                    new[x_left:x_right, :] = np.roll(
-                        new[x_left:x_right, :],
-                        chunk_shift_y,
-                        axis=1
-                    )
-                elif axis == 0:
-                    new[:, x_left:x_right] = np.roll(
-                        new[:, x_left:x_right],
-                        chunk_shift_y,
-                        axis=0
-                    )
-            img = utils.array_to_img(new)
-            self.save_frame(img)
+            line_shifts = chunk_shifts[frame_n][line_chunk_ns]
+            if axis == 1:
+                # roll each row along y by its chunk's shift
+                np.subtract(cols, line_shifts[:, np.newaxis], out=ixs)
+                np.mod(ixs, height, out=ixs)
+                ixs += rows * height
+            elif axis == 0:
+                # roll each column along x by its chunk's shift
+                np.subtract(rows, line_shifts[np.newaxis, :], out=ixs)
+                np.mod(ixs, width, out=ixs)
+                ixs *= height
+                ixs += cols
+            np.take(im_flat, ixs, axis=0, out=new_flat)
+            # hand each frame off as soon as it is produced
+            self.save_frame(utils.array_to_img(new))
         return
 
     def cleave(self,
@@ -229,52 +608,86 @@ class Sorceress(Jinx):
         # sanitize angle input to be between 0-360
         # angle = utils.angle_degrees(angle)
         # convert image to numpy array and set up new image array
-        im, width, height, _ = utils.array_from_img(self.img)
-        new = im.copy()
+        im, width, height, _ = self.get_array()
+        new = self.get_scratch(im)
+        np.copyto(new, im)
+        # pixel coordinate grids, broadcast against each other instead of looping over every pixel
+        xs = np.arange(width)[:, np.newaxis]
+        ys = np.arange(height)[np.newaxis, :]
+        self._cleave_array(im, new, xs, ys, center_point, move_chunk, pixel_shift, angle)
+        # finally, set the new array to this instance
+        self.swap_scratch(new, im)
+        return
+
+    def cleave_frames(self,
+                      angles,
+                      center_point=(0,0),
+                      move_chunk=0,
+                      pixel_shift=100,
+                      save=True):
+        """
+        Cleave the current image once per angle, each frame starting from the same (uncleaved) image.
+        The pixel coordinate grids and the output buffer are only built once and reused for every angle.
+        :param angles: list of angles at which to cleave, one frame per angle
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im, width, height, _ = self.get_array()
+        new = np.empty_like(im)
+        xs = np.arange(width)[:, np.newaxis]
+        ys = np.arange(height)[np.newaxis, :]
+        frames = []
+        for angle in angles:
+            # start each frame from the original image
+            np.copyto(new, im)
+            self._cleave_array(im, new, xs, ys, center_point, move_chunk, pixel_shift, angle)
+            img = utils.array_to_img_auto(new)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
+        return
+
+    @staticmethod
+    def _cleave_array(im, new, xs, ys, center_point, move_chunk, pixel_shift, angle):
+        """
+        Cleave the pixel array im, writing the shifted chunk into new (which should start as a copy of im).
+        :param xs: column vector of x pixel indices, shape (width, 1)
+        :param ys: row vector of y pixel indices, shape (1, height)
+        :return:
+        """
+        width, height = im.shape[0], im.shape[1]
         # calculate cleave line slope from angle; soh cah toa, where hypotenuse = 1!
         pixel_scalar_x = math.cos(math.radians(angle))
         pixel_scalar_y = math.sin(math.radians(angle))
         m = pixel_scalar_y / pixel_scalar_x
         # print(pixel_scalar_x, pixel_scalar_y, m)
 
-        def cleave_line(c_x):
-            """
-            graphtoy.com to visualize what's happening: sin(t)/cos(t) * x
-            Calculate equation of line given its slope (weknowdis) and 1 point (i.e. the center point,
-            we also knowdis)
-            :param c_x: x value of cleave line to evaluate (i.e. get cleave line y value from)
-            :return:
-            """
-            return int(m*(c_x - center_point[0]) + center_point[1])
-
-        # # debug drawing the cleave line on image
-        # for x in range(width):
-        #     y = cleave_line(x)
-        #     if (0 < x < width) and (0 < y < height):
-        #         new[x][y] = colors.RED
-
-        def shift_pixel(x, y):
-            x_new = x + int(pixel_scalar_x * pixel_shift)
-            y_new = y + int(pixel_scalar_y * pixel_shift)
-            if (0 < x_new < width) and (0 < y_new < height):
-                new[x_new][y_new] = im[x][y]
+        # cleave line y value for every x (graphtoy.com to visualize what's happening: sin(t)/cos(t) * x).
+        # Equation of line given its slope (weknowdis) and 1 point (i.e. the center point, we also knowdis)
+        y_c = np.trunc(m * (xs - center_point[0]) + center_point[1])
+        if move_chunk == 0:
+            # if move_chunk == 0, move the first chunk "before" (relatively) the line
+            chunk_mask = ys < y_c
+        elif move_chunk == 1:
+            # if move_chunk == 1, move the first chunk "after" (relatively) the line
+            chunk_mask = ys > y_c
+        else:
             return
 
-        # iterate through each pixel, shifting it if applicable
-        for x in range(width):
-            for y in range(height):
-                y_c = cleave_line(x)
-                # print(y, y_c)
-                if (y < y_c) and move_chunk == 0:
-                    # if move_chunk == 0, move the first chunk "before" (relatively) the line
-                    shift_pixel(x, y)
-                elif (y > y_c) and move_chunk == 1:
-                    # if move_chunk == 1, move the first chunk "after" (relatively) the line
-                    shift_pixel(x, y)
-
-        # finally, convert numpy array back to image and save set to this instance
-        new = utils.array_to_img(new)
-        self.img = new
+        # every pixel in the chunk shifts by the same amount, so the shift is just offset slices of the
+        # arrays; only keep pixels that land inside the image
+        shift_x = int(pixel_scalar_x * pixel_shift)
+        shift_y = int(pixel_scalar_y * pixel_shift)
+        x_lo, x_hi = max(0, 1 - shift_x), min(width, width - shift_x)
+        y_lo, y_hi = max(0, 1 - shift_y), min(height, height - shift_y)
+        if x_lo >= x_hi or y_lo >= y_hi:
+            return
+        chunk_mask = np.broadcast_to(chunk_mask, (width, height))[x_lo:x_hi, y_lo:y_hi]
+        dest = new[x_lo + shift_x:x_hi + shift_x, y_lo + shift_y:y_hi + shift_y]
+        dest[chunk_mask] = im[x_lo:x_hi, y_lo:y_hi][chunk_mask]
         return
 
     def broken_glass(self,
@@ -294,8 +707,155 @@ class Sorceress(Jinx):
         :return:
         """
 
-        im, width, height, _ = utils.array_from_img(self.img)
+        im, width, height, _ = self.get_array()
+
+        # randomly fracture the image geometry into pieces
+        polygons = self._fracture_polygons(width, height, n_fractures, bend_chance, max_bend_strength)
 
+        # debug
+        # show one shape at a time
+        # for poly in polygons:
+        #     utils.plot_shapely(poly)
+        # show all together
+        # utils.plot_shapely(polygons)
+
+        # THE FOLLOWING SECTION IS NOT NEEDED, I was simply reading the x and y-axis scaling wrong on plot_shapely() :')
+        # the above plot with all shapes together looks good with the pieces overlapping, but not
+        # each piece individually
+        # clean up polygons so they each represent a pieces itself, not the leftover blocks from
+        # the cuts
+        # polygons_temp = polygons.copy()
+        # polygons = []
+        # # for each polygon...
+        # for i, i_poly in enumerate(polygons_temp):
+        #     # copy this polygon so we can prepare to trim it
+        #     trimmed_poly = i_poly
+        #     # for each polygon to subtract from the trimmed polygon...
+        #     for j, j_poly in enumerate(polygons_temp):
+        #         # if the polygon is the same as the polygon we're trying to trim, don't do anything;
+        #         # if we subtract the polygon from itself we get nothing!
+        #         if i == j:
+        #             continue
+        #         # otherwise, if this is any other polygon, we want to subtract it if it intersects
+        #         if j_poly.intersects(trimmed_poly):
+        #             trimmed_poly = trimmed_poly.difference(j_poly)
+        #     # finally, after doing all the trimming against other shapes, append onto final list of
+        #     # polygons
+        #     polygons.append(trimmed_poly)
+        # now debug again--the shapes should now be correct! Be careful with x/y axis scaling as you
+        # view the plot of each piece, that may trip you up
+        # utils.plot_shapely(polygons)
+        # for poly in polygons:
+        #     utils.plot_shapely(poly)
+
+        # now that we have the geometry of each glass piece, extract only the pixels that match
+        # this geometry from the numpy image pixel array
+
+        # def extract_geometry(args):
+        #     """
+        #     If this point does not belong in this polygon, make it transparent, otherwise
+        #     leave the point its pre-existing color.
+        #     :return:
+        #     """
+        #     x, y, poly = args
+        #     pt = geometry.Point((x, y))
+        #     if not poly.contains(pt):
+        #         return colors.get_alpha(colors.BLACK)
+        #     return poly[x][y]
+
+        # add an alpha channel to the numpy array, keeping its other pixel colors
+        alpha_im = np.array(self.img.convert('RGBA'))
+        # rasterize every piece at once into a label map (pixel value = index of the piece it belongs to), then
+        # crop each piece to its bounding box, making any pixels that are not inside the piece transparent
+        labels = utils.rasterize_polygons(polygons, width, height)
+        pieces = self._glass_piece_sprites(alpha_im, labels, len(polygons))
+
+        # TODO: randomly remove small pieces smaller than an area threshold?
+
+        # jitter the rotation of each piece a little and paste all pieces onto final empty alpha, preserving alpha
+        # with the paste
+        alpha_im = utils.empty_alpha((width, height), return_img=True)
+        for piece_img, piece_loc in pieces:
+            rand_rot = random.uniform(-max_rand_piece_rotation, max_rand_piece_rotation)
+            self._paste_glass_piece(alpha_im, piece_img, piece_loc, rand_rot)
+
+        # debug
+        # alpha_im.show()
+
+        # finally, update the Sorceress instance
+        self.img = alpha_im
+        return
+
+    def broken_glass_frames(self,
+                            n_frames=20,
+                            n_fractures=10,
+                            bend_chance=0.5,
+                            max_bend_strength=100,
+                            max_rand_piece_rotation=45,  # in degrees
+                            max_drift=50,  # in pixels
+                            fall_distance=None,  # in pixels
+                            easing=easings.ease_in_quad,
+                            include_original=True
+                            ):
+        """
+        Animate the image shattering: the glass is fractured once, then each frame the pieces drift, rotate and fall a
+        little further. The fracture geometry and piece sprites are only computed once, so each frame only costs
+        pasting the pieces. Frames are saved with save_frame().
+        :param n_frames: number of frames in the shatter animation
+        :param max_rand_piece_rotation: in degrees, the max degrees in either direction a piece has rotated by the
+            last frame
+        :param max_drift: max number of pixels in either direction a piece has drifted by the last frame
+        :param fall_distance: about how many pixels a piece has fallen by the last frame (each piece falls a random
+            amount around this); defaults to the image height
+        :param easing: easing function for the progress of the pieces from frame to frame, ease in gives the effect
+            of gravity
+        :param include_original: save the unbroken image as the first frame
+        See broken_glass() for the fracture parameters.
+        :return:
+        """
+        im, width, height, _ = self.get_array()
+        if fall_distance is None:
+            fall_distance = width
+
+        # fracture once, and cut the image into piece sprites once
+        polygons = self._fracture_polygons(width, height, n_fractures, bend_chance, max_bend_strength)
+        labels = utils.rasterize_polygons(polygons, width, height)
+        pieces = self._glass_piece_sprites(np.array(self.img.convert('RGBA')), labels, len(polygons))
+
+        # pick where each piece ends up by the last frame
+        piece_paths = []
+        for _ in pieces:
+            rotation = random.uniform(-max_rand_piece_rotation, max_rand_piece_rotation)
+            drift_x = random.uniform(-max_drift, max_drift)
+            drift_y = random.uniform(-max_drift, max_drift)
+            fall = random.uniform(0.5, 1.5) * fall_distance
+            piece_paths.append((rotation, drift_x + fall, drift_y))
+
+        # if include_original, save the first frame as unaltered image without any breaking
+        if include_original:
+            self.save_frame()
+
+        # generate frames
+        for frame_n in range(1, n_frames + 1):
+            progress = utils.clamp(easing(frame_n / n_frames), 0, 1)
+            frame = utils.empty_alpha((width, height), return_img=True)
+            for (piece_img, piece_loc), (rotation, shift_x, shift_y) in zip(pieces, piece_paths):
+                self._paste_glass_piece(
+                    frame,
+                    piece_img,
+                    piece_loc,
+                    rotation * progress,
+                    (shift_x * progress, shift_y * progress)
+                )
+            self.save_frame(frame)
+        return
+
+    @staticmethod
+    def _fracture_polygons(width, height, n_fractures, bend_chance, max_bend_strength):
+        """
+        Randomly split the image rectangle into glass pieces. See broken_glass() for parameters.
+        :return: list of shapely polygons, in pixel coordinates
+        """
         img_poly = geometry.Polygon([
             (0, 0),
             (width, 0),
@@ -377,100 +937,56 @@ class Sorceress(Jinx):
 
         # call the recursive function, initializing the fracture # at 0
         polygons = fracture(polygons, 0)
+        return polygons
 
-        # debug
-        # show one shape at a time
-        # for poly in polygons:
-        #     utils.plot_shapely(poly)
-        # show all together
-        # utils.plot_shapely(polygons)
-
-        # THE FOLLOWING SECTION IS NOT NEEDED, I was simply reading the x and y-axis scaling wrong on plot_shapely() :')
-        # the above plot with all shapes together looks good with the pieces overlapping, but not
-        # each piece individually
-        # clean up polygons so they each represent a pieces itself, not the leftover blocks from
-        # the cuts
-        # polygons_temp = polygons.copy()
-        # polygons = []
-        # # for each polygon...
-        # for i, i_poly in enumerate(polygons_temp):
-        #     # copy this polygon so we can prepare to trim it
-        #     trimmed_poly = i_poly
-        #     # for each polygon to subtract from the trimmed polygon...
-        #     for j, j_poly in enumerate(polygons_temp):
-        #         # if the polygon is the same as the polygon we're trying to trim, don't do anything;
-        #         # if we subtract the polygon from itself we get nothing!
-        #         if i == j:
-        #             continue
-        #         # otherwise, if this is any other polygon, we want to subtract it if it intersects
-        #         if j_poly.intersects(trimmed_poly):
-        #             trimmed_poly = trimmed_poly.difference(j_poly)
-        #     # finally, after doing all the trimming against other shapes, append onto final list of
-        #     # polygons
-        #     polygons.append(trimmed_poly)
-        # now debug again--the shapes should now be correct! Be careful with x/y axis scaling as you
-        # view the plot of each piece, that may trip you up
-        # utils.plot_shapely(polygons)
-        # for poly in polygons:
-        #     utils.plot_shapely(poly)
-
-        # now that we have the geometry of each glass piece, extract only the pixels that match
-        # this geometry from the numpy image pixel array
-
-        # def extract_geometry(args):
-        #     """
-        #     If this point does not belong in this polygon, make it transparent, otherwise
-        #     leave the point its pre-existing color.
-        #     :return:
-        #     """
-        #     x, y, poly = args
-        #     pt = geometry.Point((x, y))
-        #     if not poly.contains(pt):
-        #         return colors.get_alpha(colors.BLACK)
-        #     return poly[x][y]
-
-        # add an alpha channel to the numpy array, keeping its other pixel colors, by converting to
-        # Pillow image and then back to an array again
-        alpha_im = im.copy()
-        alpha_im = utils.array_to_img_rgba(alpha_im)
-        alpha_im = utils.array_from_img(alpha_im)[0]
-        # for each polygon, copy the image, and for any pixels that are not inside the polygon make them transparent
-        piece_imgs = []
-        for poly in polygons:
-            poly_arr = alpha_im.copy()
-            for x in range(width):
-                for y in range(height):
-                    pt = geometry.Point((x, y))
-                    if not poly.contains(pt):
-                        poly_arr[x][y] = colors.get_alpha(colors.BLACK)
-            # poly_arr = np.array(list(map(extract_geometry, [x, y, poly])))
-            piece_img = utils.array_to_img_rgba(poly_arr)
-            piece_imgs.append(piece_img)
-
-        # TODO: randomly remove small pieces smaller than an area threshold?
-
-        # jitter the rotation of each piece a little
-        piece_imgs_tmp = piece_imgs.copy()
-        piece_imgs = []
-        for piece_img in piece_imgs_tmp:
-            rand_rot = random.uniform(-max_rand_piece_rotation, max_rand_piece_rotation)
-            piece_img = piece_img.rotate(rand_rot)
-            piece_imgs.append(piece_img)
-
-        # now paste all pieces onto final empty alpha, preserving alpha with the paste
-        alpha_im = utils.empty_alpha((width, height), return_img=True)
-        for piece_img in piece_imgs:
-            alpha_im.paste(
-                piece_img,
-                (0,0),
-                piece_img
-            )
-
-        # debug
-        # alpha_im.show()
-
-        # finally, update the Sorceress instance
-        self.img = alpha_im
+    @staticmethod
+    def _glass_piece_sprites(alpha_im, labels, n_pieces):
+        """
+        Cut an RGBA pixel array into one sprite per labelled piece, each cropped to the piece's bounding box.
+        :param alpha_im: RGBA pixel array
+        :param labels: int label map from utils.rasterize_polygons
+        :param n_pieces: number of labels
+        :return: list of (RGBA Pillow image, (x, y) array index of the sprite's top left corner)
+        """
+        pieces = []
+        for i in range(n_pieces):
+            piece_mask = labels == i
+            xs = np.flatnonzero(piece_mask.any(axis=1))
+            ys = np.flatnonzero(piece_mask.any(axis=0))
+            if len(xs) == 0:
+                continue
+            x_min, x_max, y_min, y_max = xs[0], xs[-1] + 1, ys[0], ys[-1] + 1
+            piece_arr = alpha_im[x_min:x_max, y_min:y_max].copy()
+            piece_arr[~piece_mask[x_min:x_max, y_min:y_max]] = 0
+            pieces.append((utils.array_to_img_rgba(piece_arr), (x_min, y_min)))
+        return pieces
+
+    @staticmethod
+    def _paste_glass_piece(canvas, piece_img, piece_loc, rotation=0, shift=(0, 0)):
+        """
+        Paste a cropped glass piece onto the canvas as if the whole canvas had been rotated around its center
+        (which is how the piece would move if it was never cropped), then shifted.
+        :param canvas: RGBA Pillow image to paste onto
+        :param piece_img: cropped RGBA piece
+        :param piece_loc: (x, y) array index of the piece's top left corner on the canvas
+        :param rotation: degrees counterclockwise
+        :param shift: (x, y) array index offset, in pixels
+        :return:
+        """
+        canvas_w, canvas_h = canvas.size
+        piece_w, piece_h = piece_img.size
+        # piece center relative to the canvas center, in Pillow (column, row) coordinates
+        du = piece_loc[1] + piece_w / 2 - canvas_w / 2
+        dv = piece_loc[0] + piece_h / 2 - canvas_h / 2
+        # rotate the piece center around the canvas center (counterclockwise on screen, with rows going down)
+        rads = math.radians(rotation)
+        new_u = du * math.cos(rads) + dv * math.sin(rads) + canvas_w / 2 + shift[1]
+        new_v = -du * math.sin(rads) + dv * math.cos(rads) + canvas_h / 2 + shift[0]
+        # rotate the piece itself around its own center
+        if rotation != 0:
+            piece_img = piece_img.rotate(rotation, expand=True)
+        corner = (int(round(new_u - piece_img.size[0] / 2)), int(round(new_v - piece_img.size[1] / 2)))
+        canvas.paste(piece_img, corner, piece_img)
         return
 
     def text(self,
@@ -488,15 +1004,57 @@ class Sorceress(Jinx):
         # print(font_path)
         # sanitize color to tuple
         color = tuple(color)
-        # draw the text
-        draw = ImageDraw.Draw(self.img)
-        font = ImageFont.truetype(font_path, size)
+        if self.backend == 'array':
+            # paste the text as a sprite straight onto the array
+            sprite, sprite_offset = utils.text_sprite(text, font_path, size, color)
+            utils.paste_sprite_array(self.arr, sprite, (loc[0] + sprite_offset[0], loc[1] + sprite_offset[1]))
+            self.set_array(self.arr)
+            return
+        # draw the text on a copy, leaving the current image as it was for any snapshot() of it,
+        # with the font parsed once per process (see utils.load_font)
+        img = self.img.copy()
+        draw = ImageDraw.Draw(img)
+        font = utils.load_font(font_path, size)
         draw.text(
             loc,
             text,
             color,
             font
         )
+        self.img = img
+        return
+
+    def text_frames(self,
+                    items,
+                    size=12,
+                    font_path='',
+                    color=colors.WHITE,
+                    save=True):
+        """
+        Add text to many frames at once, i.e. frame counters or captions. Each distinct string is only rendered once
+        into a text sprite (see utils.text_sprite), then alpha-pasted onto every frame that uses it.
+        :param items: list of (frame, text, loc), where frame is a Pillow image to draw on (in place), or None to draw
+            on a copy of this instance's img
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        # set default font
+        if font_path == '':
+            font_path = os.path.join(Jinx.fonts_folder, 'ClearSans-Regular.ttf')
+        # sanitize color to tuple
+        color = tuple(color)
+        frames = []
+        for frame, text, loc in items:
+            if frame is None:
+                frame = self.img.copy()
+            sprite, sprite_offset = utils.text_sprite(text, font_path, size, color)
+            frame.paste(sprite, (loc[0] + sprite_offset[0], loc[1] + sprite_offset[1]), sprite)
+            if save:
+                self.save_frame(frame)
+            else:
+                frames.append(frame)
+        if not save:
+            return frames
         return
 
     def neon(self,
@@ -509,6 +1067,25 @@ class Sorceress(Jinx):
         """
         Detect edges on image, copy the edges, offset them, change their color
         to give multi-color glow effect to image.
+        The thickened edges are cached per source image, so applying neon to the same image again (i.e. after
+        reload() in a frame loop) skips edge detection.
+        """
+        # get numpy pixel array from image
+        im, width, height, _ = self.get_array()
+        out = self.get_scratch(im[..., :3])
+        final_im = self._neon_array(im, neon_colors, thickness, offset, white_fill_thresh, black_thresh, out=out)
+        # update this instance
+        self.swap_scratch(final_im, im)
+        # debug
+        # self.img.show()
+        return
+
+    def _neon_array(self, im, neon_colors=None, thickness=5, offset=200, white_fill_thresh=230, black_thresh=50,
+                    out=None):
+        """
+        Neon effect on the pixel array im. See neon() for parameters.
+        :param out: optional uint8 RGB array, same width/height as im, to composite into
+        :return: uint8 RGB array
         """
         # Pillow only allows max kernel size of 5, raise error
         if thickness > 5:
@@ -521,51 +1098,90 @@ class Sorceress(Jinx):
                            colors.NEON_PURPLE]
             # shuffle image color order for fun
             random.shuffle(neon_colors)
+        im = im[..., :3]
+        # get (thickened) edges from image, as a mask of the pixels bright enough to fill with neon color
+        edge_mask = self._neon_edge_mask(im, thickness, white_fill_thresh)
+        # composite all neon colors and then the base image on top, in place in one uint8 array
+        if out is None:
+            out = np.zeros(im.shape, dtype=np.uint8)
+        else:
+            out.fill(0)
+        self._neon_composite(out, im, edge_mask, neon_colors, offset, black_thresh)
+        return out
+
+    def neon_frames(self,
+                    n_frames=10,
+                    neon_colors=None,
+                    thickness=5,
+                    offset=200,
+                    white_fill_thresh=230,
+                    black_thresh=50):
+        """
+        Animate the neon effect on the current image: edges are only detected once, and each frame only re-randomizes
+        the offset of each neon color. Frames are saved with save_frame(). See neon() for parameters.
+        :param n_frames: number of frames to save
+        :return:
+        """
+        if thickness > 5:
+            raise Exception("Error: max thickness is 5.")
+        shuffle_colors = neon_colors is None
+        if neon_colors is None:
+            neon_colors = [colors.NEON_PINK,
+                           colors.NEON_BLUE,
+                           colors.NEON_PURPLE]
 
-        # get edges from image
-        grayscale = self.get_grayscale()
-        edges = grayscale.filter(ImageFilter.FIND_EDGES)
-        # edges.show()
+        im, width, height, _ = self.get_array()
+        im = im[..., :3]
+        edge_mask = self._neon_edge_mask(im, thickness, white_fill_thresh)
+        # reuse the same output buffer every frame
+        final_im = np.empty(im.shape, dtype=np.uint8)
+        for _ in range(n_frames):
+            if shuffle_colors:
+                random.shuffle(neon_colors)
+            final_im.fill(0)
+            self._neon_composite(final_im, im, edge_mask, neon_colors, offset, black_thresh)
+            self.save_frame(utils.array_to_img(final_im))
+        return
 
-        # get numpy pixel array from image
-        im, width, height, _ = utils.array_from_img(self.img)
-        final_im = np.zeros(im.shape)
+    def _neon_edge_mask(self, im, thickness, white_fill_thresh):
+        """
+        Get the mask of thickened edge pixels brighter than white_fill_thresh. Edge detection and thickening are
+        cached by the image pixels and thickness, so repeated calls on the same image only re-threshold.
+        :param im: RGB pixel array of the current image
+        :return: boolean array of shape (width, height)
+        """
+        cache_key = (im.shape, utils.array_digest(im), thickness)
+        if self._neon_edge_cache is None or self._neon_edge_cache[0] != cache_key:
+            grayscale = Image.fromarray(im).convert('L')
+            edges = grayscale.filter(ImageFilter.FIND_EDGES)
+            # edges.show()
+            # make neon lines thicker
+            thick_edges = edges.filter(ImageFilter.MaxFilter(size=thickness))
+            self._neon_edge_cache = (cache_key, np.array(thick_edges))
+        thick_edges = self._neon_edge_cache[1]
+        return thick_edges > white_fill_thresh
 
-        # duplicate edges by however many colors there are and color all the white pixels (defined by threshold
-        # val below) that neon color
-        neon_imgs = []
+    @staticmethod
+    def _neon_composite(final_im, im, edge_mask, neon_colors, offset, black_thresh):
+        """
+        Offset the edge mask a bit randomly for each neon color and paint it into final_im, then paint the base image on
+        top. Like the layers in the original effect, only color channels brighter than black_thresh are painted.
+        :param final_im: uint8 RGB array to composite into, in place
+        :param im: RGB pixel array of the base image
+        :param edge_mask: boolean edge mask from _neon_edge_mask()
+        :return:
+        """
         for neon_color in neon_colors:
-            neon_img = edges.copy()
-            # make neon lines thicker
-            neon_img = neon_img.filter(ImageFilter.MaxFilter(size=thickness))
-            # add glow by blurring and then re-drawing line
-            # neon_img = neon_img.filter(ImageFilter.GaussianBlur(radius=blur_radius))
-            # neon_img = neon_img.filter(ImageFilter.BLUR)
-            # offset a bit randomly in any direction
+            # offset a bit randomly in any direction (wrapping around the image edges)
             rand_x = random.uniform(0, 1)
             rand_y = random.uniform(0, 1)
-            neon_img = ImageChops.offset(neon_img, int(rand_x*offset), int(rand_y*offset))
-            # convert to numpy array
-            neon_im, width, height, _ = utils.array_from_img(neon_img)
-            # create new blank reference with color channel -- need to do this .shape on original image because it still
-            # has color channel
-            new_neon_im = np.zeros(im.shape)
-            # fill color channel with neon color instead of white from grayscale
-            new_neon_im[neon_im > white_fill_thresh] = neon_color
-            # convert to image and append this neon image to list of neon images to overlay
-            # new_neon_im = utils.array_to_img(new_neon_im)
-            neon_imgs.append(new_neon_im)
-            # debug
-            # new_neon_im.show()
+            neon_mask = np.roll(edge_mask, (int(rand_y*offset), int(rand_x*offset)), axis=(0, 1))
+            # fill color channel with neon color
+            for c, channel_val in enumerate(neon_color):
+                if channel_val > black_thresh:
+                    np.copyto(final_im[..., c], channel_val, where=neon_mask)
         # combine base image on top of all neon images
-        for neon_img in neon_imgs:
-            final_im[neon_img > black_thresh] = neon_img[neon_img > black_thresh]
-        final_im[im > black_thresh] = im[im > black_thresh]
-        # convert np array to img and update img ref
-        final_im = utils.array_to_img(final_im)
-        self.img = final_im
-        # debug
-        # final_im.show()
+        np.copyto(final_im, im, where=im > black_thresh)
         return
 
     def rose_petal(self,
@@ -580,7 +1196,9 @@ class Sorceress(Jinx):
                    expansion_rate=2.0,  # matches the scale of the outer ring compared to original
                    expansion_direction=0,  # 0 for petals on outside bigger, 1 for petals on inside bigger
                    resolution_downscale=0.25,  # will help with run time since we may be pasting so many
-                   blur_gradient_easing=easings.ease_out_linear
+                   blur_gradient_easing=easings.ease_out_linear,
+                   rotation_step=1.0,  # in degrees; petal rotations are rounded to this step so they can be reused
+                   seed=None
                    ):
         """
         Add rose petal effect. Take image, paste it a bunch of times as petals in circular rings.
@@ -592,392 +1210,1596 @@ class Sorceress(Jinx):
             over as rose petals
         :param blur_gradient_easing: function at which to control the rate of blur as radius from
             image center increases
+        :param rotation_step: petals are only scaled once per ring, and each rotated petal is cached by its rotation
+            rounded to this many degrees. Set to 0 to rotate every petal by its exact random angle.
+        :param seed: seed for the petal center noise and rotations
+        :return:
+        """
+        rings, ref_img, new_img, rose_center = self._rose_petal_rings(
+            size, n_rings, paste_order, ring_radius, petal_center_noise, n_petals_per_ring, rose_center,
+            rand_rotation, expansion_rate, expansion_direction, resolution_downscale, blur_gradient_easing,
+            rotation_step, seed
+        )
+        # paste altered reference photo onto final image many times, once for each petal!
+        for ring_petals in rings:
+            for petal_img, corner in ring_petals:
+                new_img.paste(
+                    petal_img,  # image to paste
+                    corner,  # location at which to paste image
+                    petal_img  # mask used to paste the image--this retains alpha channel
+                )
+            # debug each ring
+            # new_img.show()
+
+        # do paste for very center of rose
+        new_img.paste(
+            ref_img,  # image to paste
+            rose_center,  # location at which to paste image
+            ref_img  # mask used to paste the image--this retains alpha channel
+        )
+        # update this instance's img
+        self.img = new_img
+        # debug
+        # self.img.show()
+        return
+
+    def rose_petal_frames(self,
+                          frame_per_petal=False,
+                          size=None,
+                          n_rings=5,
+                          paste_order=1,  # 0 for starting out to in, 1 for in to out
+                          ring_radius=50,  # in pixels
+                          petal_center_noise=25,  # in pixels; randomly shift points a little from ring
+                          n_petals_per_ring=15,
+                          rose_center=None,  # center of the rose circle from which all rings will bloom
+                          rand_rotation=0,  # in max degrees, amount of randomness in petal rotation around ring
+                          expansion_rate=2.0,  # matches the scale of the outer ring compared to original
+                          expansion_direction=0,  # 0 for petals on outside bigger, 1 for petals on inside bigger
+                          resolution_downscale=0.25,  # will help with run time since we may be pasting so many
+                          blur_gradient_easing=easings.ease_out_linear,
+                          rotation_step=1.0,  # in degrees; petal rotations are rounded to this step
+                          seed=None
+                          ):
+        """
+        Animate the rose blooming: render the rose petal effect ring by ring onto one canvas, saving a frame with
+        save_frame() after each ring (or each petal). The whole bloom costs one rose_petal() render. The last frame
+        (with the center petal pasted) is the finished rose, which is also set as this instance's img.
+        :param frame_per_petal: if True, save a frame after every petal instead of after every ring
+        See rose_petal() for the other parameters; paste_order defaults to blooming from the inside out.
         :return:
         """
+        rings, ref_img, new_img, rose_center = self._rose_petal_rings(
+            size, n_rings, paste_order, ring_radius, petal_center_noise, n_petals_per_ring, rose_center,
+            rand_rotation, expansion_rate, expansion_direction, resolution_downscale, blur_gradient_easing,
+            rotation_step, seed
+        )
+        for ring_petals in rings:
+            for petal_img, corner in ring_petals:
+                new_img.paste(petal_img, corner, petal_img)
+                if frame_per_petal:
+                    self.save_frame(new_img)
+            if not frame_per_petal:
+                self.save_frame(new_img)
+        # do paste for very center of rose
+        new_img.paste(ref_img, rose_center, ref_img)
+        self.save_frame(new_img)
+        self.img = new_img
+        return
+
+    def _rose_petal_rings(self,
+                          size,
+                          n_rings,
+                          paste_order,
+                          ring_radius,
+                          petal_center_noise,
+                          n_petals_per_ring,
+                          rose_center,
+                          rand_rotation,
+                          expansion_rate,
+                          expansion_direction,
+                          resolution_downscale,
+                          blur_gradient_easing,
+                          rotation_step,
+                          seed):
+        """
+        Lay out every rose petal. See rose_petal() for parameters. Petal centers for all rings are computed at once,
+        petals outside the image are culled, the reference image is scaled once per ring, and rotated petals are
+        cached by (ring, rotation).
+        :return: (a generator of the list of (petal image, paste corner) for each ring in paste order,
+            downscaled reference image, empty RGBA canvas, rose center)
+        """
         # handle inputs
         if size is None:
             size = self.img.size
-        # if bg_color is None:
-        #     bg_color = colors.WHITE
-        # if blur_color is None:
-        #     blur_color = colors.WHITE
+        rng = np.random.default_rng(seed)
         # downsize reference image
-        # self.img.show()
         ref_img = self.img.copy()
-        # print(self.img.size)
         new_size = (ref_img.size[0] * resolution_downscale, ref_img.size[1] * resolution_downscale)
         new_size = list(map(int, new_size))
-        # print(new_size)
         # thumbnail operation rescales image
-        ref_img.thumbnail(new_size, Image.ANTIALIAS)
-        # img.show()
+        ref_img.thumbnail(new_size, Image.LANCZOS)
         # blur edges on reference photo by creating new Sorceress from this image and calling
         # .alpha_border! So meta!
         ref_sorc = Sorceress(img=ref_img)
         ref_sorc.alpha_border(gradient_easing=blur_gradient_easing)  # radius=edge_blur_radius
-        # ref_sorc.show()
         ref_img = ref_sorc.img
-        # ref_img.show()
-        # set up final pixel array (add RGBA color dimension to end)
-        size = (size[0], size[1], 4)
-        # new = np.zeros(size)
-        # bg_color.append(0)  # add alpha channel
-        # new[:, :] = bg_color
-        new = np.empty(size)
-        new_img = utils.array_to_img_rgba(new)  # Image.fromarray(new.astype('uint8'), 'RGBA')
-        # im, width, height, _ = utils.array_from_img(self.img)
+        # set up final empty RGBA canvas
+        new_img = utils.empty_alpha(size, return_img=True)
 
         if rose_center is None:
-            rose_center = (new.shape[0]//2, new.shape[1]//2)  # center the circle at the center of the new image
-        # print(rose_center)
+            rose_center = (size[0]//2, size[1]//2)  # center the circle at the center of the new image
 
         # calculate ring radii based on expansion rate. Expansion rate of 1 means the radii increase linearly,
         # <1 means the distance between rings get shorter the farther out, >1 means the distance between
         # rings gets greater the farther out
-        # ring_radii = np.linspace(ring_radius, ring_radius * n_rings, n_rings)
-        def get_ring_radius(rn):
-            max_radius = ring_radius * n_rings
-            if expansion_rate == 1:
-                return ((max_radius - ring_radius)/n_rings) * rn
-            elif expansion_rate < 1:
-                return ((ring_radius - ring_radius*n_rings)/(n_rings**2)) * (rn - n_rings)**2 + ring_radius*n_rings
-            elif expansion_rate > 1:
-                return ((ring_radius*n_rings - ring_radius)/(n_rings**2)) * (rn**2) + ring_radius
-            return None
-        ring_radii = [get_ring_radius(rn) for rn in range(n_rings)]
-        # print(ring_radii)
+        rns = np.arange(n_rings)
+        max_radius = ring_radius * n_rings
+        if expansion_rate == 1:
+            ring_radii = ((max_radius - ring_radius)/n_rings) * rns
+        elif expansion_rate < 1:
+            ring_radii = ((ring_radius - max_radius)/(n_rings**2)) * (rns - n_rings)**2 + max_radius
+        else:
+            ring_radii = ((max_radius - ring_radius)/(n_rings**2)) * (rns**2) + ring_radius
         # reverse the order of the radii array so the petal copies will be pasted in order of outer-most
         # to inner-most ring
         if paste_order == 0:
             ring_radii = np.flip(ring_radii)
-        # get how many radians each petal will sweep
-        radians_per_petal = axioms.CIRCLE_TOTAL_RADIANS / n_petals_per_ring
-        # paste altered reference photo onto final image many times, once for each petal!
-        # paste_coords = []
-        for ring_n, ring_radius in enumerate(ring_radii):
-            ring_elapsed_radians = 0
-            for _ in range(n_petals_per_ring):
-                # get true x/y value along ring
-                x = ring_radius * math.cos(ring_elapsed_radians) + rose_center[0]
-                y = ring_radius * math.sin(ring_elapsed_radians) + rose_center[1]
-                # add some noise if desired (no noise if petal_center_noise=0) (thank u for
-                # fucking it up c: )
-                x += random.uniform(-petal_center_noise, petal_center_noise)
-                y += random.uniform(-petal_center_noise, petal_center_noise)
-                # finally, convert theoretical x/y values to integer pixel locations
-                x = int(x)
-                y = int(y)
-                # only continue if point within image bounds
-                if (0 < x < size[0]) and (0 < y < size[1]):
-                    # make a copy of the reference image just for this petal
-                    petal_img = ref_img.copy()
-                    # resize the petal based on expansion rate
-                    if expansion_direction == 0:
-                        expansion_multiplier = ((1-expansion_rate)/(n_rings-1)) * (ring_n+1) + expansion_rate
-                    else:
-                        expansion_multiplier = ((expansion_rate-1)/(n_rings-1)) * (ring_n+1)
-                    # print(f"{expansion_rate}, {n_rings}, {ring_n}, {expansion_multiplier}")
-                    new_size = (
-                        int(ref_img.size[0] * expansion_multiplier),
-                        int(ref_img.size[1] * expansion_multiplier)
-                    )
-                    if expansion_multiplier < 0:
-                        new_size = (new_size[0] * -1, new_size[1] * -1)
-                        petal_img.thumbnail(new_size, Image.ANTIALIAS)
-                    else:
-                        petal_img = petal_img.resize(new_size)
-                    # print(ref_img.size, new_size)
-
-                    # rotate image a little bit
-                    rand_rot = random.uniform(-rand_rotation, rand_rotation)
-                    petal_img = petal_img.rotate(rand_rot, Image.NEAREST, expand=1)
-
-                    # print((x, y))
-                    # calculate x/y corner positions (we want center of image to be pasted on xy coord)
-                    x_tl_corner = x - petal_img.size[0]//2
-                    y_tl_corner = y - petal_img.size[1]//2
-                    # paste the image here!
-                    new_img.paste(
-                        petal_img,  # image to paste
-                        (x_tl_corner, y_tl_corner),  # location at which to paste image
-                        petal_img  # mask used to paste the image--this retains alpha channel
-                    )
-                    # debug point at which to paste image as red dot!
-                    # red_alph = [colors.RED[0], colors.RED[1], colors.RED[2], 1]
-                    # new[x][y] = red_alph
-                    # instead, paste later so that we can shuffle the list of coords and paste
-                    # in a random order?
-                    # paste_coords.append((x_tl_corner, y_tl_corner))
-                # finally, increment the angle segment to go to next petal
-                ring_elapsed_radians += radians_per_petal
-                # debug each petal
-                # utils.debug_pixel_arr(new)
-            # debug each ring
-            # utils.debug_pixel_arr(new)
-        # # re-organize the corrdinates if random shuffle desired
-        #
-        # # iterate thru the coordinates
-        # new_img.paste(
-        #     ref_img,  # image to paste
-        #     (x_tl_corner, y_tl_corner),  # location at which to paste image
-        #     ref_img  # mask used to paste the image--this retains alpha channel
-        # )
-
-        # do paste for very center of rose
-        new_img.paste(
-            ref_img,  # image to paste
-            rose_center,  # location at which to paste image
-            ref_img  # mask used to paste the image--this retains alpha channel
-        )
 
-        # using debug array
-        # img = utils.array_to_img(new)
-        # img.show()
-        # update this instance's img
-        self.img = new_img
-        # debug
-        # self.img.show()
+        # get the angle of each petal around its ring (stepping each petal around the ring by how many radians each
+        # petal sweeps)
+        radians_per_petal = axioms.CIRCLE_TOTAL_RADIANS / n_petals_per_ring
+        petal_radians = np.cumsum(np.hstack([0, np.full(n_petals_per_ring - 1, radians_per_petal)]))
+        # get true x/y value along ring of every petal in every ring at once, shape (n_rings, n_petals_per_ring)
+        xs = ring_radii[:, np.newaxis] * np.cos(petal_radians) + rose_center[0]
+        ys = ring_radii[:, np.newaxis] * np.sin(petal_radians) + rose_center[1]
+        # add some noise if desired (no noise if petal_center_noise=0) (thank u for fucking it up c: )
+        xs += rng.uniform(-petal_center_noise, petal_center_noise, size=xs.shape)
+        ys += rng.uniform(-petal_center_noise, petal_center_noise, size=ys.shape)
+        # finally, convert theoretical x/y values to integer pixel locations
+        xs = xs.astype(int)
+        ys = ys.astype(int)
+        # only keep points within image bounds
+        in_bounds = (0 < xs) & (xs < size[0]) & (0 < ys) & (ys < size[1])
+        # rotate each petal a little bit
+        rotations = rng.uniform(-rand_rotation, rand_rotation, size=xs.shape)
+        if rotation_step > 0:
+            rotations = np.round(rotations / rotation_step) * rotation_step
+
+        def ring_petals(ring_n):
+            # resize the petal based on expansion rate, once for the whole ring
+            if expansion_direction == 0:
+                expansion_multiplier = ((1-expansion_rate)/(n_rings-1)) * (ring_n+1) + expansion_rate
+            else:
+                expansion_multiplier = ((expansion_rate-1)/(n_rings-1)) * (ring_n+1)
+            # print(f"{expansion_rate}, {n_rings}, {ring_n}, {expansion_multiplier}")
+            new_size = (
+                int(ref_img.size[0] * expansion_multiplier),
+                int(ref_img.size[1] * expansion_multiplier)
+            )
+            if expansion_multiplier < 0:
+                new_size = (new_size[0] * -1, new_size[1] * -1)
+                scaled_img = ref_img.copy()
+                scaled_img.thumbnail(new_size, Image.LANCZOS)
+            else:
+                scaled_img = ref_img.resize(new_size)
+            # rotated petals for this ring, by rotation
+            rotated_imgs = {}
+            petals = []
+            for petal_n in np.flatnonzero(in_bounds[ring_n]):
+                rotation = rotations[ring_n, petal_n]
+                if rotation not in rotated_imgs:
+                    rotated_imgs[rotation] = scaled_img.rotate(rotation, Image.NEAREST, expand=1)
+                petal_img = rotated_imgs[rotation]
+                # calculate x/y corner positions (we want center of image to be pasted on xy coord)
+                x_tl_corner = int(xs[ring_n, petal_n]) - petal_img.size[0]//2
+                y_tl_corner = int(ys[ring_n, petal_n]) - petal_img.size[1]//2
+                petals.append((petal_img, (x_tl_corner, y_tl_corner)))
+            return petals
+
+        rings = (ring_petals(ring_n) for ring_n in range(n_rings) if in_bounds[ring_n].any())
+        return rings, ref_img, new_img, rose_center
+
+    def gradient(self,
+                 kind='linear',  # 'linear', 'radial' or 'angular'
+                 start_color=colors.BLACK,
+                 end_color=colors.WHITE,
+                 easing=easings.ease_out_linear,  # easing of the ramp from start_color to end_color
+                 blend='normal',  # how the gradient combines with the image
+                 opacity=0.5,  # 0 to 1
+                 angle=0,  # degrees counterclockwise from pointing right, for linear and angular gradients
+                 center=None  # (x, y) array index of the center of radial and angular gradients
+                 ):
+        """
+        Add gradient filter over image. The ramp from start_color to end_color is cached (see utils.gradient_ramp), so
+        changing colors, blend or opacity between frames reuses it.
+        :param kind: 'linear' along angle, 'radial' out from center, or 'angular' around center starting at angle
+        :param start_color: [R, G, B] color at the start of the ramp
+        :param end_color: [R, G, B] color at the end of the ramp
+        :param easing: easing function for the ramp
+        :param blend: 'normal', 'multiply', 'screen', 'overlay' or 'add'
+        :param opacity: how strongly the blended gradient replaces the image, 0 to 1
+        :param angle: direction of linear gradients, or where angular gradients start, in degrees counterclockwise
+            from pointing right
+        :param center: (x, y) array index of the center of radial and angular gradients, defaults to the middle
+        :return:
+        """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        ramp = self._gradient_ramp(im.shape[:2], kind, easing, angle, center)
+        out = self.get_scratch(im)
+        self._gradient_array(im, ramp, start_color, end_color, blend, opacity, out)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, im)
         return
 
-    def gradient(self):
+    def gradient_frames(self,
+                        n_frames=10,
+                        kind='linear',
+                        start_color=colors.BLACK,
+                        end_color=colors.WHITE,
+                        easing=easings.ease_out_linear,
+                        blend='normal',
+                        opacity=0.5,
+                        angle=0,
+                        center=None,
+                        fade_easing=easings.ease_out_linear,
+                        save=True):
         """
-        Add gradient filter over image.
+        Fade the gradient in over the current image, from opacity 0 on the first frame to opacity on the last one.
+        The ramp is only computed once. See gradient() for parameters.
+        :param n_frames: number of frames
+        :param fade_easing: easing function from 0 to 1 for the opacity over the frames
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
         """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        ramp = self._gradient_ramp(im.shape[:2], kind, easing, angle, center)
+        progress = np.linspace(0, 1, n_frames) if n_frames > 1 else np.ones(1)
+        out = np.empty_like(im)
+        frames = []
+        for frame_opacity in opacity * utils.eval_easing(fade_easing, progress):
+            self._gradient_array(im, ramp, start_color, end_color, blend, frame_opacity, out)
+            img = utils.array_to_img_auto(out)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
         return
 
+    @staticmethod
+    def _gradient_ramp(shape, kind, easing, angle, center):
+        """
+        Get the (cached) ramp of a gradient, with the center made hashable.
+        :return: see utils.gradient_ramp()
+        """
+        if center is not None:
+            center = tuple(float(c) for c in center)
+        return utils.gradient_ramp(tuple(shape), kind, easing, float(angle) % 360, center)
+
+    @staticmethod
+    def _gradient_array(im, ramp, start_color, end_color, blend, opacity, out):
+        """
+        Blend the gradient of ramp from start_color to end_color over the color channels of RGB or RGBA pixel array im
+        into out; any alpha channel is copied over unchanged. See gradient() for parameters.
+        :param ramp: ramp from _gradient_ramp(), broadcastable to im's width and height
+        :return: out
+        """
+        start = np.asarray(start_color[:3], dtype=np.float32) / 255
+        end = np.asarray(end_color[:3], dtype=np.float32) / 255
+        # gradient colors, still only as big as the ramp (i.e. one column for a vertical linear gradient)
+        grad = start + ramp[..., np.newaxis] * (end - start)
+        base = im[..., :3].astype(np.float32) / 255
+        if blend == 'normal':
+            blended = np.broadcast_to(grad, base.shape)
+        elif blend == 'multiply':
+            blended = base * grad
+        elif blend == 'screen':
+            blended = 1 - (1 - base) * (1 - grad)
+        elif blend == 'overlay':
+            blended = np.where(base < 0.5, 2 * base * grad, 1 - 2 * (1 - base) * (1 - grad))
+        elif blend == 'add':
+            blended = np.minimum(base + grad, 1)
+        else:
+            raise Exception("Error: unable to understand blend, was expecting 'normal', 'multiply', 'screen', "
+                            "'overlay' or 'add'.")
+        base += (blended - base) * opacity
+        out[..., :3] = np.rint(base * 255)
+        if im.shape[2] > 3:
+            out[..., 3:] = im[..., 3:]
+        return out
+
     def offset(self,
-               rect=None,
+               rect=None,  # (x0, y0, x1, y1) array index bounds of the sub-region, defaults to the whole image
+               shift=(0, 0),  # (x, y) pixels to move the sub-region's contents down and right
+               wrap=True  # wrap contents around the sub-region, or else repeat its edge into the uncovered part
                ):
         """
-        Define sub-region within image to offset.
+        Define sub-region within image to offset. The contents of the sub-region slide by shift, and either wrap
+        around to the other side of it or leave its edge pixels stretched over the part they uncover. Only the
+        sub-region is touched (see region()), so a small sub-region of a big image is cheap with either backend, except
+        with the Pillow backend right after snapshot() or restore(), when the whole image is copied once first.
+        :param rect: (x0, y0, x1, y1) array index bounds of the sub-region (x is the row), x1 and y1 not included
+        :param shift: (x, y) pixels to move the contents by, down and to the right; negative to move up and left
+        :param wrap: if True, contents pushed out of one side of the sub-region come back in the other side
         :return:
         """
-        if rect is None:
-            rect = (0, 0, 0, 0)
+        with self.region(rect) as sub:
+            view = sub.arr
+            self._offset_array(view.copy(), shift, wrap, out=view)
         return
 
-    def scuff(self):
+    def offset_frames(self,
+                      n_frames=10,
+                      rect=None,
+                      shift=None,
+                      wrap=True,
+                      save=True):
+        """
+        Scroll the sub-region from no offset up to shift over the frames. With the default shift and wrap, the
+        contents scroll once all the way around the sub-region to the right, so the animation loops. The image is
+        converted once, and each frame only rewrites the sub-region. See offset() for parameters.
+        :param n_frames: number of frames
+        :param shift: (x, y) offset reached after the last frame, defaults to (0, sub-region height)
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        frame = self.arr.copy()
+        rows, cols = self._rect_slices(frame.shape, rect)
+        view = frame[rows, cols]
+        source = view.copy()
+        if shift is None:
+            shift = (0, view.shape[1])
+        frames = []
+        for progress in np.arange(n_frames) / n_frames:
+            self._offset_array(source, (progress * shift[0], progress * shift[1]), wrap, out=view)
+            img = utils.array_to_img_auto(frame)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
+        return
+
+    @staticmethod
+    def _offset_array(src, shift, wrap, out):
+        """
+        Write the contents of pixel array src offset by shift into out, by slice assignment. out must be the same shape
+        as src and must not share memory with it. See offset() for parameters.
+        :return: out
+        """
+        width, height = src.shape[:2]
+        dx, dy = int(round(shift[0])), int(round(shift[1]))
+        if wrap:
+            dx, dy = dx % width, dy % height
+            # the four blocks src is cut into by the wrap
+            out[dx:, dy:] = src[:width - dx, :height - dy]
+            out[:dx, dy:] = src[width - dx:, :height - dy]
+            out[dx:, :dy] = src[:width - dx, height - dy:]
+            out[:dx, :dy] = src[width - dx:, height - dy:]
+            return out
+        # moving further than the sub-region leaves only the far edge, same as moving just short of it
+        dx = min(max(dx, 1 - width), width - 1)
+        dy = min(max(dy, 1 - height), height - 1)
+        out[max(dx, 0):width + min(dx, 0), max(dy, 0):height + min(dy, 0)] = \
+            src[max(-dx, 0):width - max(dx, 0), max(-dy, 0):height - max(dy, 0)]
+        # stretch the edge over the uncovered rows, then columns (which also covers the corners)
+        if dx > 0:
+            out[:dx] = out[dx:dx + 1]
+        elif dx < 0:
+            out[width + dx:] = out[width + dx - 1:width + dx]
+        if dy > 0:
+            out[:, :dy] = out[:, dy:dy + 1]
+        elif dy < 0:
+            out[:, height + dy:] = out[:, height + dy - 1:height + dy]
+        return out
+
+    def scuff(self,
+              amount=0.5,  # 0 to 1
+              grime_scale=4,  # bigger for smaller patches of grime
+              scratch_scale=3,  # bigger for shorter, curlier scratches
+              scratch_width=0.04,  # 0 to 1, fraction of the noise that counts as scratch
+              octaves=4,
+              scratch_color=colors.WHITE,
+              seed=0):
         """
         Scuff up image.
+        Grime darkens the image in blotches, and thin scratches lighten it toward scratch_color. Both come from
+        tileable noise textures (see utils.noise_tile) that are only generated once per octaves, scale and seed, and
+        are stretched over the image.
+        :param amount: strength of the grime and scratches, 0 to 1
+        :param grime_scale: number of grime blotches across the image, roughly
+        :param scratch_scale: number of scratch curls across the image, roughly
+        :param scratch_width: width of the scratches, as the fraction of the noise around its midpoint that is drawn
+        :param octaves: layers of detail in the noise
+        :param scratch_color: [R, G, B] color of the scratches
+        :param seed: seed of the noise textures
+        :return:
+        """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        grime = self._scuff_noise(im.shape[:2], grime_scale, octaves, seed)
+        scratches = self._scuff_noise(im.shape[:2], scratch_scale, octaves, seed + 1)
+        out = self.get_scratch(im)
+        self._scuff_array(im, grime, scratches, amount, scratch_width, scratch_color, out)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, im)
+        return
+
+    def scuff_frames(self,
+                     n_frames=20,
+                     amount=0.5,
+                     grime_scale=4,
+                     scratch_scale=3,
+                     scratch_width=0.04,
+                     octaves=4,
+                     scratch_color=colors.WHITE,
+                     seed=0,
+                     save=True):
+        """
+        Animate the scratches running down the image like an old film, scrolling the scratch texture through exactly
+        one tile so the animation loops. The textures are only generated once; each frame only looks them up at a
+        new offset. See scuff() for parameters.
+        :param n_frames: number of frames in the loop
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        # the grime stays put, only the scratches scroll
+        grime = self._scuff_noise(im.shape[:2], grime_scale, octaves, seed)
+        out = np.empty_like(im)
+        frames = []
+        for frame_n in range(n_frames):
+            scratches = self._scuff_noise(im.shape[:2], scratch_scale, octaves, seed + 1, scroll=frame_n / n_frames)
+            self._scuff_array(im, grime, scratches, amount, scratch_width, scratch_color, out)
+            img = utils.array_to_img_auto(out)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
+        return
+
+    @staticmethod
+    def _scuff_noise(shape, scale, octaves, seed, scroll=0):
+        """
+        Look up scuff noise over an image, one tile stretched over the whole image.
+        :param scroll: fraction of a tile to scroll the noise down by
+        :return: noise
+        """
+        tile = utils.noise_tile(octaves, scale, seed)
+        return utils.noise_lookup(tile, shape, max(shape) / tile.shape[0], offset=(-scroll * tile.shape[0], 0))
+
+    @staticmethod
+    def _scuff_array(im, grime, scratches, amount, scratch_width, scratch_color, out):
+        """
+        Scuff the color channels of RGB or RGBA pixel array im into out; any alpha channel is copied over unchanged.
+        See scuff() for parameters.
+        :return: out
+        """
+        # grime darkens where the noise is above its midpoint, more the higher it is
+        shade = 1 - amount * np.clip(2 * grime - 1, 0, 1)
+        # scratches are the thin lines where the noise crosses its midpoint
+        scratch = amount * np.clip(1 - np.abs(2 * scratches - 1) / max(scratch_width, 1e-6), 0, 1)
+        scratch_color = np.asarray(scratch_color[:3], dtype=np.float32)
+        base = im[..., :3] * shade[..., np.newaxis]
+        base += (scratch_color - base) * scratch[..., np.newaxis]
+        # amount above 1 overshoots past black and the scratch color: clip so it can't wrap around in uint8
+        np.clip(base, 0, 255, out=base)
+        out[..., :3] = np.rint(base)
+        if im.shape[2] > 3:
+            out[..., 3:] = im[..., 3:]
+        return out
+
+    def glitch(self,
+               channel_shift=8,  # max columns each of the red and blue channels slide
+               n_blocks=6,  # number of horizontal bands to displace
+               block_height=None,  # max rows in a band
+               block_shift=40,  # max columns a band slides
+               n_scanlines=4,  # number of rows to smear downward
+               scanline_length=12,  # max rows a smeared row repeats over
+               seed=None):
+        """
+        Digital glitch: the red and blue channels slide sideways from the green one, horizontal bands of the image
+        slide sideways (wrapping around), and a few rows get smeared down over the rows below them.
+        :param channel_shift: max columns the red and blue channels are offset, each in a random direction
+        :param n_blocks: number of bands to displace
+        :param block_height: max rows in a displaced band, defaults to a tenth of the image
+        :param block_shift: max columns a band is displaced, in a random direction
+        :param n_scanlines: number of rows to duplicate down over the rows below
+        :param scanline_length: max number of rows each duplicated row covers
+        :param seed: seed for numpy's random Generator; the same seed on the same image gives the same glitch
         :return:
         """
-        # self.img = self.get_grayscale()
-        # self.img = self.get_edges()
-        # self.save()
-        # self.show()
+        im, width, height, _ = self.get_array()
+        out = self.get_scratch(im)
+        rng = np.random.default_rng(seed)
+        self._glitch_array(im, out, rng, channel_shift, n_blocks, block_height, block_shift, n_scanlines,
+                           scanline_length)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, im)
         return
 
-    def glitch(self):
+    def glitch_frames(self,
+                      n_frames=10,
+                      channel_shift=8,
+                      n_blocks=6,
+                      block_height=None,
+                      block_shift=40,
+                      n_scanlines=4,
+                      scanline_length=12,
+                      seed=None,
+                      save=True):
+        """
+        Animate the glitch: every frame glitches the current image a different way, from one random Generator seeded
+        once, so the same seed gives the same frames. The image is only read once and the output buffer is reused.
+        See glitch() for parameters.
+        :param n_frames: number of frames
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im, width, height, _ = self.get_array()
+        out = np.empty_like(im)
+        rng = np.random.default_rng(seed)
+        frames = []
+        for _ in range(n_frames):
+            self._glitch_array(im, out, rng, channel_shift, n_blocks, block_height, block_shift, n_scanlines,
+                               scanline_length)
+            img = utils.array_to_img_auto(out)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
         return
 
+    @staticmethod
+    def _glitch_array(im, out, rng, channel_shift, n_blocks, block_height, block_shift, n_scanlines,
+                      scanline_length):
+        """
+        Glitch pixel array im into out (not sharing memory with im), drawing all randomness from the numpy Generator
+        rng. See glitch() for parameters.
+        :return: out
+        """
+        width, height = im.shape[0], im.shape[1]
+        if block_height is None:
+            block_height = max(width // 10, 1)
+
+        def wrap_columns(dst, src, shift):
+            # dst = src slid right by shift columns (left if negative), wrapping around, without a temporary copy
+            shift %= src.shape[1]
+            if shift == 0:
+                dst[...] = src
+                return
+            dst[:, shift:] = src[:, :-shift]
+            dst[:, :shift] = src[:, -shift:]
+            return
+
+        # slide the red and blue channels away from the green one
+        np.copyto(out, im)
+        if im.ndim == 3 and channel_shift > 0:
+            for channel in (0, 2):
+                wrap_columns(out[..., channel], im[..., channel], int(rng.integers(-channel_shift, channel_shift + 1)))
+        # displace horizontal bands, all channels together
+        for _ in range(n_blocks):
+            row = int(rng.integers(0, width))
+            band = out[row:row + int(rng.integers(1, block_height + 1))]
+            wrap_columns(band, band.copy(), int(rng.integers(-block_shift, block_shift + 1)))
+        # smear rows down over the rows below them
+        for _ in range(n_scanlines):
+            row = int(rng.integers(0, width))
+            out[row + 1:row + 1 + int(rng.integers(1, scanline_length + 1))] = out[row]
+        return out
+
     def stripe(self):
         return
 
-    def tree(self):
+    def tree(self,
+             n_attractors=3000,  # number of random points the branches grow toward
+             attractors=None,  # or, (n, 2) array of (x, y) array indexes to grow toward
+             root=None,  # (x, y) array index the tree grows from
+             step=None,  # pixels each branch grows per step
+             influence_distance=None,  # pixels away an attractor can pull a branch from
+             kill_distance=None,  # pixels from a branch at which an attractor is reached and removed
+             max_thickness=None,  # thickness of the trunk, in pixels
+             color=colors.WHITE,
+             max_steps=1000,
+             seed=None):
         """
         An abstract drawing of a tree-like structure, which could be interpreted as tree branches
         or veins or a river delta or whatever.
+        Grown by space colonization: every step, each attractor pulls the branch node nearest to it (within
+        influence_distance), each pulled node grows a new node step pixels toward the average direction of its
+        attractors, and attractors within kill_distance of a node are removed. Nearest nodes are found with a uniform
+        grid (see utils.grid_nearest), so tens of thousands of attractors are fine. Branches are drawn over the
+        image, thicker toward the root (each branch is as thick as all the tips it feeds).
+        :param n_attractors: number of random attractors, spread over the top three quarters of the image
+        :param attractors: or, array of (x, y) array indexes of the attractors, i.e. to grow veins into a shape
+        :param root: (x, y) array index the tree grows from, defaults to the middle of the bottom of the image
+        :param step: pixels each branch grows per step, defaults to 1/200 of the smaller side of the image
+        :param influence_distance: defaults to 15 steps
+        :param kill_distance: defaults to 2 steps
+        :param max_thickness: thickness of the trunk in pixels, defaults to 1/60 of the smaller side of the image
+        :param color: [R, G, B] color of the branches
+        :param max_steps: max number of growth steps
+        :param seed: seed for numpy's random Generator, for the random attractors
         :return:
         """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        nodes, parents, node_steps, radii = self._grow_tree(
+            im.shape[:2], n_attractors, attractors, root, step, influence_distance, kill_distance, max_thickness,
+            max_steps, seed
+        )
+        self._paint_branches(im, nodes, parents, radii, np.arange(1, len(nodes)), color)
+        # set back onto this instance (in place with the array backend)
+        self.set_array(im)
+        return
+
+    def tree_frames(self,
+                    steps_per_frame=5,
+                    n_attractors=3000,
+                    attractors=None,
+                    root=None,
+                    step=None,
+                    influence_distance=None,
+                    kill_distance=None,
+                    max_thickness=None,
+                    color=colors.WHITE,
+                    max_steps=1000,
+                    seed=None,
+                    save=True):
+        """
+        Animate the tree growing: the tree is grown once, then each frame draws the branches grown in the next
+        steps_per_frame growth steps over the previous frame. See tree() for parameters.
+        :param steps_per_frame: growth steps drawn per frame
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        nodes, parents, node_steps, radii = self._grow_tree(
+            im.shape[:2], n_attractors, attractors, root, step, influence_distance, kill_distance, max_thickness,
+            max_steps, seed
+        )
+        canvas = im.copy()
+        frames = []
+        for first_step in range(1, node_steps.max() + 1, steps_per_frame):
+            # only draw this frame's branches onto the canvas
+            node_ixs = np.nonzero((node_steps >= first_step) & (node_steps < first_step + steps_per_frame))[0]
+            self._paint_branches(canvas, nodes, parents, radii, node_ixs, color)
+            img = utils.array_to_img_auto(canvas)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
         return
 
+    @staticmethod
+    def _grow_tree(shape, n_attractors, attractors, root, step, influence_distance, kill_distance, max_thickness,
+                   max_steps, seed):
+        """
+        Grow a tree by space colonization. See tree() for parameters.
+        :return: (n nodes, 2) node positions, parent index of each node (-1 for the root), growth step each node was
+            grown at (0 for the root), brush radius of the branch ending at each node
+        """
+        width, height = shape
+        rng = np.random.default_rng(seed)
+        if attractors is None:
+            attractors = rng.random((n_attractors, 2)) * (width * 0.75, height)
+        attractors = np.asarray(attractors, dtype=float).reshape(-1, 2)
+        if root is None:
+            root = (width - 1, (height - 1) / 2)
+        if step is None:
+            step = max(min(shape) / 200, 1.)
+        if influence_distance is None:
+            influence_distance = 15 * step
+        if kill_distance is None:
+            kill_distance = 2 * step
+        if max_thickness is None:
+            max_thickness = max(min(shape) / 60, 2)
+
+        def reserve(arr, n):
+            # make room for n nodes, doubling the capacity so appending nodes every step stays cheap
+            if n <= len(arr):
+                return arr
+            bigger = np.empty((max(n, 2 * len(arr)),) + arr.shape[1:], dtype=arr.dtype)
+            bigger[:len(arr)] = arr
+            return bigger
+
+        nodes = np.empty((256, 2))
+        nodes[0] = root
+        parents = np.empty(256, dtype=np.intp)
+        parents[0] = -1
+        node_steps = np.zeros(256, dtype=int)
+        n_nodes = 1
+        # spots already grown into (to half a step), so a node pulled from both sides can't keep regrowing in place:
+        # a grid of half steps over everywhere the tree can reach (the attractors and root, and a step past them),
+        # lined up with multiples of half a step
+        spot_size = step / 2
+        reach = np.vstack([attractors, np.reshape(root, (1, 2))])
+        spots_origin = np.floor((reach.min(axis=0) - step) / spot_size) - 1
+        n_spots = (np.ceil((reach.max(axis=0) + step) / spot_size) + 2 - spots_origin).astype(np.intp)
+        grown_spots = np.zeros(tuple(n_spots), dtype=bool)
+
+        def spot_ixs(points):
+            spots = np.clip(np.rint(points / spot_size) - spots_origin, 0, n_spots - 1).astype(np.intp)
+            return spots[:, 0], spots[:, 1]
+
+        grown_spots[spot_ixs(nodes[:1])] = True
+        # attractors don't move, so index them once; each step only the newly grown nodes look up the attractors
+        # around them, to update the nearest node of just the attractors they reach
+        attractor_index = utils.grid_index(attractors, influence_distance)
+        alive = np.ones(len(attractors), dtype=bool)
+        n_alive, alive_sum = len(attractors), attractors.sum(axis=0)
+        nearest = np.full(len(attractors), -1, dtype=np.intp)
+        dist = np.full(len(attractors), np.inf)
+        # alive attractors with a node in reach (the growth front), sorted
+        active = np.zeros(0, dtype=np.intp)
+        first_new = 0
+        for step_n in range(1, max_steps + 1):
+            pair_nodes, pair_attractors, pair_dist = utils.grid_pairs(
+                attractor_index, nodes[first_new:n_nodes], influence_distance
+            )
+            # only the pairs bringing a live attractor closer to the tree than it was need sorting
+            closer = alive[pair_attractors] & (pair_dist < dist[pair_attractors])
+            reached, reached_nodes, reached_dist = utils.closest_per_key(
+                pair_attractors[closer], pair_nodes[closer], pair_dist[closer]
+            )
+            newly_active = reached[np.isinf(dist[reached])]
+            nearest[reached] = reached_nodes + first_new
+            dist[reached] = reached_dist
+            # remove the attractors that have been reached
+            killed = reached[reached_dist < kill_distance]
+            alive[killed] = False
+            n_alive -= len(killed)
+            alive_sum = alive_sum - attractors[killed].sum(axis=0)
+            active = np.union1d(active, newly_active)
+            active = active[alive[active]]
+            if n_alive == 0:
+                break
+            if n_alive < len(attractors) * 3 / 4:
+                # a quarter of the indexed attractors are reached, index only the rest so the front stops checking them
+                active = (np.cumsum(alive) - 1)[active]
+                attractors, nearest, dist = attractors[alive], nearest[alive], dist[alive]
+                alive = alive[alive]
+                attractor_index = utils.grid_index(attractors, influence_distance)
+            if len(active) > 0:
+                # each pulled node grows toward the average direction of the attractors pulling it
+                pulls = (attractors[active] - nodes[nearest[active]]) / dist[active][:, np.newaxis]
+                grow_from, pulled_by = np.unique(nearest[active], return_inverse=True)
+                directions = np.zeros((len(grow_from), 2))
+                np.add.at(directions, pulled_by, pulls)
+            else:
+                # nothing in reach yet: grow the newest node toward the middle of the attractors
+                grow_from = np.array([n_nodes - 1])
+                directions = (alive_sum / n_alive)[np.newaxis] - nodes[grow_from]
+            lengths = np.hypot(*directions.T)
+            has_direction = lengths > 1e-9
+            grow_from = grow_from[has_direction]
+            new_nodes = nodes[grow_from] + directions[has_direction] / lengths[has_direction, np.newaxis] * step
+            # only grow into spots not grown into before, and only once per spot this step
+            new_spots = spot_ixs(new_nodes)
+            is_new = ~grown_spots[new_spots]
+            first_in_spot = np.zeros(len(new_nodes), dtype=bool)
+            first_in_spot[np.unique(np.ravel_multi_index(new_spots, grown_spots.shape), return_index=True)[1]] = True
+            is_new &= first_in_spot
+            if not is_new.any():
+                break
+            new_nodes = new_nodes[is_new]
+            grown_spots[new_spots[0][is_new], new_spots[1][is_new]] = True
+            first_new, n_nodes = n_nodes, n_nodes + len(new_nodes)
+            nodes, parents, node_steps = (reserve(arr, n_nodes) for arr in (nodes, parents, node_steps))
+            nodes[first_new:n_nodes] = new_nodes
+            parents[first_new:n_nodes] = grow_from[is_new]
+            node_steps[first_new:n_nodes] = step_n
+        nodes, parents, node_steps = nodes[:n_nodes], parents[:n_nodes], node_steps[:n_nodes]
+
+        # pipe model: each branch is as thick as the number of tips it feeds, by area
+        n_tips = (np.bincount(parents[1:], minlength=len(nodes)) == 0).astype(float)
+        for node_n in range(len(nodes) - 1, 0, -1):
+            n_tips[parents[node_n]] += n_tips[node_n]
+        radii = np.rint(max_thickness / 2 * np.sqrt(n_tips / n_tips[0])).astype(int)
+        return nodes, parents, node_steps, radii
+
+    @staticmethod
+    def _paint_branches(im, nodes, parents, radii, node_ixs, color):
+        """
+        Draw the branches ending at node_ixs onto RGB or RGBA pixel array im in place, all branches of the same
+        radius at once: points every pixel along the branches, stamped with a disk of the radius.
+        :return: im
+        """
+        if len(node_ixs) == 0:
+            return im
+        starts, ends = nodes[parents[node_ixs]], nodes[node_ixs]
+        n_samples = int(np.ceil(np.hypot(*(ends - starts).T).max())) + 1
+        ts = np.linspace(0, 1, n_samples)[np.newaxis, :, np.newaxis]
+        branch_pts = starts[:, np.newaxis] + (ends - starts)[:, np.newaxis] * ts
+        branch_radii = radii[node_ixs]
+        paint = np.asarray(color[:3], dtype=np.uint8)
+        for radius in np.unique(branch_radii):
+            pts = np.unique(np.rint(branch_pts[branch_radii == radius]).astype(np.intp).reshape(-1, 2), axis=0)
+            pixels = (pts[:, np.newaxis] + utils.disk_offsets(int(radius))).reshape(-1, 2)
+            in_bounds = ((pixels[:, 0] >= 0) & (pixels[:, 0] < im.shape[0]) &
+                         (pixels[:, 1] >= 0) & (pixels[:, 1] < im.shape[1]))
+            rows, cols = pixels[in_bounds].T
+            im[rows, cols, :3] = paint
+            if im.shape[2] > 3:
+                im[rows, cols, 3] = 255
+        return im
+
     def snake(self,
               ring_inner_radius=200,
               ring_outer_radius=300,
-              ring_center=(0,0),
+              ring_center=None,
               n_pieces=3,
-              piece_connector_easing=easings.ease_in_out_normal
+              piece_connector_easing=easings.ease_in_out_normal,
+              angle=0,
+              sampling='bilinear'
               ):
         """
         Add snake effect. Make image rotate around in an offset circle, so it loops around
-        back into itself.
+        back into itself. The ring is cut into n_pieces, and each piece is a copy of the image bent along its arc
+        (columns around the ring, the top row on the outside), pinching in where the pieces connect. The image is
+        replaced with the ring on a transparent background, the same size as the image.
+        :param ring_inner_radius: inner radius of the ring, in pixels
+        :param ring_outer_radius: outer radius of the ring, in pixels
+        :param ring_center: (x, y) array index of the ring center, defaults to the middle of the image
+        :param n_pieces: number of copies of the image around the ring
+        :param piece_connector_easing: easing function from 0 to 1 along a piece giving its thickness (0 to 1 of the
+            ring), i.e. the default bell curve pinches each piece to a point where it connects to the next one
+        :param angle: degrees to rotate the pieces around the ring
+        :param sampling: 'nearest' or 'bilinear', see utils.remap()
         :return:
         """
+        im = self._snake_source()
+        piece = self._snake_piece(im, ring_inner_radius, ring_outer_radius, n_pieces,
+                                  self._snake_profile(piece_connector_easing), sampling)
+        lookup = self._snake_lookup(im.shape[:2], ring_inner_radius, ring_outer_radius, ring_center, n_pieces, piece)
+        self.set_array(self._snake_array(piece, lookup, angle, sampling))
+        return
 
-        im, width, height, _ = utils.array_from_img(self.img)
-        # print((width, height))
-
-        center_pt = geometry.point.Point(ring_center)
-        inner_circle = center_pt.buffer(ring_inner_radius)  # returns polygon object
-        outer_circle = center_pt.buffer(ring_outer_radius)  # returns polygon object
-        # utils.plot_shapely([inner_circle, outer_circle])
-        # print(inner_circle, outer_circle)
-
-        # cut the inner circle out of the outer circle geometry to create donut (snake)
-        inner_circle_coords = inner_circle.exterior.coords
-        outer_circle_coords = outer_circle.exterior.coords
-        snake = geometry.Polygon(shell=outer_circle_coords, holes=[inner_circle_coords])  # exterior, list of holes
-        # print(snake)
-        # utils.plot_shapely(snake)
-
-        # equally divide the circumference of the rings into n_pieces, i.e. extract every n_coords//n_pieces
-        # coordinate from list
-        # print((len(inner_circle_coords), len(outer_circle_coords)))
-        inner_slice_pts = inner_circle_coords[::len(inner_circle_coords) // n_pieces]
-        outer_slice_pts = outer_circle_coords[::len(outer_circle_coords) // n_pieces]
-        # print((inner_slice_pts, outer_slice_pts))
-        # test_objs = [snake, geometry.Polygon(inner_slice_pts, [outer_slice_pts])]
-        # utils.plot_shapely(test_objs)
-
-        slice_pt_pairs = list(zip(inner_slice_pts, outer_slice_pts))
-        # print(slice_pt_pairs)
-        # for p in slice_pt_pairs:
-        #     print(p)
-        cut_lines = []
-        for pair in slice_pt_pairs:
-            cut_line = geometry.LineString(pair)
-            cut_lines.append(cut_line)
-
-        # test_objs = [snake, *cut_lines]
-        # utils.plot_shapely(test_objs)
-
-        # handle the floor division creating too many cut lines (just pop off however many extra there are)
-        n_pieces_diff = len(cut_lines) - n_pieces
-        for _ in range(n_pieces_diff):
-            cut_lines.pop()
-
-        # test_objs = [snake, *cut_lines]
-        # utils.plot_shapely(test_objs)
-
-        # TODO: warp each line depending on the piece_connector_easing
-
-        # can't do ops.split by line because cutting a line into the donut does not produce 2 new polygons since
-        # the sides will still touch... so, get pairs of all cut_lines in sequence and turn cut_lines into triangles.
-        # 4 cut lines = 4 triangles each at 90 deg angle, 3 cut lines = 3 triangles each at 60 deg angle. So of each
-        # triangle is 360 / n triangles
-        # debug before we extend the cut lines
-        # utils.plot_shapely(cut_lines)
-        cut_lines_temp = cut_lines.copy()
-        cut_lines = []
-        for cut_line in cut_lines_temp:
-            # replace first point with center point of circle,
-            # replace 2nd point with 2nd point scaled up in size arbitrarily so that the resulting triangles using
-            # this edge do not create a cord in the circle when we do the split (the segment produced in the triangle
-            # will be outside the circle and so we're only cutting perpendicular to the donut edges)
-            safe_expansion_scalar = 3  # this is the arbitrary scalar to scale up the cut line
-            cut_line = cut_line.coords
-            cut_line = [
-                center_pt,
-                (cut_line[1][0] * safe_expansion_scalar, cut_line[1][1] * safe_expansion_scalar)
-            ]
-            cut_line = geometry.LineString(cut_line)
-            cut_lines.append(cut_line)
-        # debug after extending the cut lines
-        # utils.plot_shapely(cut_lines)
-
-        # now create pairs of cut lines to form triangles
-        triangles = []
-        # duplicate the first cut line and append it at the end (because I'm lazy) so that the last triangle
-        # can be formed
-        cut_lines.append(cut_lines[0])
-        for i, cut_line in enumerate(cut_lines):
-            if i == 0:
-                continue
-            prev_cut_line = cut_lines[i-1]
-            # create new line segment connecting the outer points of the 2 cut lines
-            # (not inner point which is coords[0]; this is already connected in the previous step--at the circle
-            # center!)
-            # this 3rd line is just so when we debug plot_shapely we can make sure that this line is not intersecting
-            # the donut!
-            new_line_seg = geometry.LineString(
-                [
-                    prev_cut_line.coords[1],
-                    cut_line.coords[1]
-                ]
-            )
-            # create triangle geometry from the 3 lines by converting the 3 LineStrings
-            # into 1 LineString
-            # grabbing its convex hull results in a polygon, but splitting a polygon by a polygon is not supported
-            lines = [prev_cut_line, cut_line, new_line_seg]
-            all_pts = []
-            for line in lines:
-                line_pts = [line.coords[0], line.coords[1]]
-                for pt in line_pts:
-                    if pt not in all_pts:
-                        all_pts.append(pt)
-            # duplicate first point and add to the end to connect the linestring
-            all_pts.append(all_pts[0])
-            ls = geometry.LineString(all_pts)
-            # triangle = ls.convex_hull
-            # triangles.append(triangle)
-            # triangles.append(triangle)
-            triangles.append(ls)
-            # debug just this triangle
-            # debug_objs = [ls, snake]
-            # utils.plot_shapely(debug_objs)
-        # debug triangles!
-        # debug_objs = triangles.copy()
-        # debug_objs.append(snake)
-        # utils.plot_shapely(debug_objs)
-
-        # now cut the donut by the triangular LineStrings
-        pieces = []
-        for t in triangles:
-            result = ops.split(snake, t)
-            # only keep the smaller piece resulting from the cut
-            piece_cut = result.geoms[0]
-            for geom in result.geoms:
-                # utils.plot_shapely(geom)
-                if geom.area < piece_cut.area:
-                    piece_cut = geom
-            pieces.append(piece_cut)
-        # debug donut cut pieces! yay, it works!
-        # utils.plot_shapely(pieces)
+    def snake_frames(self,
+                     n_frames=30,
+                     ring_inner_radius=200,
+                     ring_outer_radius=300,
+                     ring_center=None,
+                     n_pieces=3,
+                     piece_connector_easing=easings.ease_in_out_normal,
+                     sampling='bilinear',
+                     save=True):
+        """
+        Animate the snake going around the ring. The frames turn the pieces through exactly one piece's worth of
+        angle, so the animation loops. The piece and where each ring pixel samples it are only computed once (see
+        _snake_piece() and _snake_lookup()); each frame only changes the angle offset. See snake() for parameters.
+        :param n_frames: number of frames in the loop
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im = self._snake_source()
+        piece = self._snake_piece(im, ring_inner_radius, ring_outer_radius, n_pieces,
+                                  self._snake_profile(piece_connector_easing), sampling)
+        lookup = self._snake_lookup(im.shape[:2], ring_inner_radius, ring_outer_radius, ring_center, n_pieces, piece)
+        # reuse the same output buffer every frame
+        out = None
+        frames = []
+        for frame_n in range(n_frames):
+            out = self._snake_array(piece, lookup, 360 / n_pieces * frame_n / n_frames, sampling, out=out)
+            img = utils.array_to_img_rgba(out)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
+        return
 
-        # find the center point of each donut piece
-        piece_centers = []
-        for piece in pieces:
-            piece_centers.append(piece.centroid)
-        # debug centroids
-        # debug_objs = [*pieces, *piece_centers]
-        # utils.plot_shapely(debug_objs)
+    def _snake_source(self):
+        """
+        Get the current image as an RGBA pixel array for the snake's pieces.
+        :return: uint8 array of shape (width, height, 4)
+        """
+        im, width, height, image_colors = self.get_array()
+        if image_colors == 4:
+            return im
+        return np.array(self.img.convert('RGBA'))
 
+    @staticmethod
+    def _snake_ring(shape, inner_radius, outer_radius, center):
+        """
+        Fill in the default center of the snake's ring, and get the (cached) polar coordinates of its pixels.
+        :return: see utils.ring_coords()
+        """
+        if center is None:
+            center = ((shape[0] - 1) / 2, (shape[1] - 1) / 2)
+        return utils.ring_coords(tuple(shape), tuple(float(c) for c in center), float(inner_radius),
+                                 float(outer_radius))
 
-        return
+    @staticmethod
+    def _snake_profile(easing, n_samples=1024):
+        """
+        Sample the piece thickness easing once into a lookup table, so frames interpolate it instead of calling it for
+        every pixel.
+        :return: (x samples, thickness samples)
+        """
+        xs = np.linspace(0, 1, n_samples + 1)
+        return xs, np.clip(utils.eval_easing(easing, xs), 0, 1)
 
-    def banner(self):
+    @staticmethod
+    def _snake_piece(im, inner_radius, outer_radius, n_pieces, profile, sampling):
+        """
+        Render one piece of the snake unrolled from the ring: rows go across the ring from its outer edge in to its
+        inner edge, columns go along the piece (one per pixel of arc on the outer edge). Pixels past the piece's
+        thickness are transparent, but keep the color of the piece's edge so sampling across it doesn't darken it.
+        The last column repeats the first, so sampling past the end of the piece wraps into the next one.
+        :param im: RGBA pixel array from _snake_source()
+        :param profile: thickness lookup table from _snake_profile()
+        :return: RGBA uint8 array of shape (n rows, n columns + 1, 4)
+        """
+        if not 0 <= inner_radius < outer_radius:
+            raise Exception("Error: ring inner radius must be at least 0 and less than the outer radius.")
+        n_rows = int(math.ceil(outer_radius - inner_radius)) + 1
+        n_cols = max(int(math.ceil(2 * math.pi * outer_radius / n_pieces)), 2)
+        mid_radius, half_width = (inner_radius + outer_radius) / 2, (outer_radius - inner_radius) / 2
+        # radius of each row, and how far along the piece each column is
+        rho = np.linspace(outer_radius, inner_radius, n_rows)[:, np.newaxis]
+        along = (np.arange(n_cols) / n_cols)[np.newaxis, :]
+        thickness = np.interp(along, *profile) * half_width
+        # image columns go along the piece, image rows go across it from the outside in; remap() takes rows past the
+        # thickness (or anywhere a piece pinches to nothing) to the image's edge rows
+        src_cols = np.broadcast_to(along * (im.shape[1] - 1), (n_rows, n_cols)).astype(np.float32)
+        src_rows = ((mid_radius + thickness - rho) / np.maximum(2 * thickness, 1e-6)
+                    * (im.shape[0] - 1)).astype(np.float32)
+        piece = np.empty((n_rows, n_cols + 1, 4), dtype=np.uint8)
+        utils.remap(im, src_rows, src_cols, sampling=sampling, out=piece[:, :n_cols])
+        piece[:, :n_cols, 3][np.abs(rho - mid_radius) > thickness] = 0
+        piece[:, n_cols] = piece[:, 0]
+        return piece
+
+    @staticmethod
+    def _snake_lookup(shape, inner_radius, outer_radius, center, n_pieces, piece):
+        """
+        Where each pixel of the ring samples the unrolled piece from _snake_piece(), before the pieces are turned.
+        :return: image shape, (rows, columns) of the ring pixels, their row in the piece, their column along all the
+            pieces end to end (turning the pieces only shifts this, see _snake_array()), columns per degree of turn,
+            and the number of columns in one piece
+        """
+        rows, cols, rho, turn = Sorceress._snake_ring(shape, inner_radius, outer_radius, center)
+        n_rows, n_cols = piece.shape[0], piece.shape[1] - 1
+        piece_rows = ((outer_radius - rho) / (outer_radius - inner_radius) * (n_rows - 1)).astype(np.float32)
+        ring_cols = turn * (n_pieces * n_cols)
+        return tuple(shape), rows, cols, piece_rows, ring_cols, n_pieces * n_cols / 360, n_cols
+
+    @staticmethod
+    def _snake_array(piece, lookup, angle, sampling, out=None):
+        """
+        Render the snake's ring from its unrolled piece, with the pieces turned by angle degrees. See snake() for
+        parameters.
+        :param piece: unrolled piece from _snake_piece()
+        :param lookup: ring lookup from _snake_lookup(), for the same piece
+        :param out: optional RGBA uint8 array of the image's width and height to render into
+        :return: out
+        """
+        shape, rows, cols, piece_rows, ring_cols, cols_per_degree, n_cols = lookup
+        if out is None:
+            out = np.empty(shape + (4,), dtype=np.uint8)
+        out.fill(0)
+        if len(rows) == 0:
+            return out
+        # turning the pieces just slides every ring pixel along them
+        piece_cols = ((ring_cols - angle * cols_per_degree) % n_cols).astype(np.float32)
+        out[rows, cols] = utils.remap(piece, piece_rows, piece_cols, sampling=sampling)
+        return out
+
+    def banner(self,
+               amount=0.35,  # 0 to 1
+               fold_scale=3,  # bigger for more, narrower folds
+               fold_stretch=4,  # how much longer the folds are than wide
+               octaves=3,
+               seed=0):
         """
         Shade a background a bit in some spots to give cloth-like effect.
+        The shading is tileable noise (see utils.noise_tile), stretched down the image into hanging folds, that
+        lightens and darkens the image.
+        :param amount: strength of the shading, 0 to 1
+        :param fold_scale: number of folds across the image, roughly
+        :param fold_stretch: how much the noise is stretched down the image
+        :param octaves: layers of detail in the noise, i.e. creases in the folds
+        :param seed: seed of the noise texture
         :return:
         """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        folds = self._banner_folds(im.shape[:2], fold_scale, fold_stretch, octaves, seed, 0)
+        out = self.get_scratch(im)
+        self._banner_array(im, folds, amount, out)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, im)
         return
 
-    def glare(self):
+    def banner_frames(self,
+                      n_frames=20,
+                      amount=0.35,
+                      fold_scale=3,
+                      fold_stretch=4,
+                      octaves=3,
+                      seed=0,
+                      save=True):
+        """
+        Animate the banner waving: the folds scroll across the image through exactly one tile, so the animation
+        loops. The texture is only generated once; each frame only looks it up at a new offset. See banner() for
+        parameters.
+        :param n_frames: number of frames in the loop
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        out = np.empty_like(im)
+        frames = []
+        for frame_n in range(n_frames):
+            folds = self._banner_folds(im.shape[:2], fold_scale, fold_stretch, octaves, seed, frame_n / n_frames)
+            self._banner_array(im, folds, amount, out)
+            img = utils.array_to_img_auto(out)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
+        return
+
+    @staticmethod
+    def _banner_folds(shape, fold_scale, fold_stretch, octaves, seed, scroll):
+        """
+        Look up the fold noise over an image, one tile across the image and stretched down it.
+        :param scroll: fraction of a tile to scroll the folds across by
+        :return: fold noise
+        """
+        tile = utils.noise_tile(octaves, fold_scale, seed)
+        zoom = shape[1] / tile.shape[1]
+        return utils.noise_lookup(tile, shape, (zoom * fold_stretch, zoom), offset=(0, -scroll * tile.shape[1]))
+
+    @staticmethod
+    def _banner_array(im, folds, amount, out):
+        """
+        Shade the color channels of RGB or RGBA pixel array im by the folds into out; any alpha channel is copied over
+        unchanged. See banner() for parameters.
+        :return: out
+        """
+        shade = 1 + amount * (2 * folds - 1)
+        base = im[..., :3] * shade[..., np.newaxis]
+        np.clip(base, 0, 255, out=base)
+        out[..., :3] = np.rint(base)
+        if im.shape[2] > 3:
+            out[..., 3:] = im[..., 3:]
+        return out
+
+    def glare(self,
+              n_lights=3,
+              ring_radius=None,  # pixels from ring_center to each light
+              ring_center=None,  # (x, y) array index of the middle of the ring of lights
+              light_radius=None,  # pixels each light reaches
+              easing=easings.ease_in_quad,  # falloff of each light from its middle to its edge
+              color=colors.WHITE,
+              intensity=0.8,  # 0 to 1
+              angle=0,  # degrees counterclockwise from pointing right to the first light
+              combine='add'):
         """
         Add glossy glare effect. Change light source to allow multiple lights in a ring.
+        The lights are spread evenly around a ring and screened over the image. Each light is one cached falloff
+        kernel (see utils.light_kernel) moved into place, and all lights are combined at once.
+        :param n_lights: number of lights around the ring
+        :param ring_radius: pixels from ring_center to each light, defaults to a quarter of the smaller side of the image
+        :param ring_center: (x, y) array index of the middle of the ring, defaults to the middle of the image
+        :param light_radius: pixels each light reaches, defaults to a fifth of the smaller side of the image
+        :param easing: easing function from 0 (edge of a light) to 1 (its middle)
+        :param color: [R, G, B] color of the lights
+        :param intensity: brightness of the lights, 0 to 1
+        :param angle: degrees counterclockwise from pointing right, from ring_center to the first light
+        :param combine: 'add' to add up overlapping lights, or 'max' to take the brightest
         :return:
         """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        kernel, positions = self._glare_lights(im.shape[:2], n_lights, ring_radius, ring_center, light_radius, easing,
+                                               angle)
+        fields = np.empty((n_lights,) + im.shape[:2], dtype=np.float32)
+        out = self.get_scratch(im)
+        self._glare_array(im, kernel, positions, color, intensity, combine, fields, out)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, im)
+        return
+
+    def glare_frames(self,
+                     n_frames=20,
+                     n_lights=3,
+                     ring_radius=None,
+                     ring_center=None,
+                     light_radius=None,
+                     easing=easings.ease_in_quad,
+                     color=colors.WHITE,
+                     intensity=0.8,
+                     angle=0,
+                     combine='add',
+                     save=True):
+        """
+        Animate the lights orbiting the ring. The frames turn the ring through exactly the angle between two lights,
+        so the animation loops. The falloff kernel is only computed once; each frame only moves it to the new
+        light positions. See glare() for parameters.
+        :param n_frames: number of frames in the loop
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            im = np.array(self.img.convert('RGB'))
+        # reuse the same light fields and output buffer every frame
+        fields = np.empty((n_lights,) + im.shape[:2], dtype=np.float32)
+        out = np.empty_like(im)
+        frames = []
+        for frame_n in range(n_frames):
+            frame_angle = angle + 360 / n_lights * frame_n / n_frames
+            kernel, positions = self._glare_lights(im.shape[:2], n_lights, ring_radius, ring_center, light_radius,
+                                                   easing, frame_angle)
+            self._glare_array(im, kernel, positions, color, intensity, combine, fields, out)
+            img = utils.array_to_img_auto(out)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
         return
 
+    @staticmethod
+    def _glare_lights(shape, n_lights, ring_radius, ring_center, light_radius, easing, angle):
+        """
+        Fill in the defaults of glare(), and get the (cached) falloff kernel and the position of each light.
+        :return: kernel, list of (x, y) array index of each light
+        """
+        if n_lights < 1:
+            raise Exception("Error: glare needs at least 1 light.")
+        if ring_radius is None:
+            ring_radius = min(shape) / 4
+        if ring_center is None:
+            ring_center = ((shape[0] - 1) / 2, (shape[1] - 1) / 2)
+        if light_radius is None:
+            light_radius = min(shape) / 5
+        kernel = utils.light_kernel(max(int(round(light_radius)), 1), easing)
+        positions = []
+        for light_n in range(n_lights):
+            rads = math.radians(angle + 360 * light_n / n_lights)
+            positions.append((
+                int(round(ring_center[0] - ring_radius * math.sin(rads))),
+                int(round(ring_center[1] + ring_radius * math.cos(rads)))
+            ))
+        return kernel, positions
+
+    @staticmethod
+    def _glare_array(im, kernel, positions, color, intensity, combine, fields, out):
+        """
+        Screen the lights over the color channels of RGB or RGBA pixel array im into out; any alpha channel is copied
+        over unchanged. See glare() for parameters.
+        :param kernel: falloff kernel of one light, from utils.light_kernel()
+        :param positions: list of (x, y) array index of each light
+        :param fields: float32 array of shape (n lights, width, height) to lay out the lights in
+        :return: out
+        """
+        width, height = im.shape[0], im.shape[1]
+        radius = kernel.shape[0] // 2
+        # move the kernel to each light by slicing, clipped to the image
+        fields.fill(0)
+        for field, (row, col) in zip(fields, positions):
+            r0, c0 = max(row - radius, 0), max(col - radius, 0)
+            r1, c1 = min(row + radius + 1, width), min(col + radius + 1, height)
+            if r0 < r1 and c0 < c1:
+                field[r0:r1, c0:c1] = kernel[r0 - row + radius:r1 - row + radius, c0 - col + radius:c1 - col + radius]
+        # all lights at once
+        if combine == 'add':
+            light = fields.sum(axis=0)
+        elif combine == 'max':
+            light = fields.max(axis=0)
+        else:
+            raise Exception("Error: unable to understand combine, was expecting 'add' or 'max'.")
+        np.clip(light, 0, 1, out=light)
+        light *= intensity
+        # screen the light color over the image
+        light_color = np.asarray(color[:3], dtype=np.float32) / 255
+        base = im[..., :3].astype(np.float32) / 255
+        base = 1 - (1 - base) * (1 - light[..., np.newaxis] * light_color)
+        out[..., :3] = np.rint(base * 255)
+        if im.shape[2] > 3:
+            out[..., 3:] = im[..., 3:]
+        return out
+
     def dilate_contract(self,
-                        amount=-1  # positive to dilate, negative to contract
+                        amount=-1,  # positive to dilate, negative to contract
+                        region=None,  # boolean mask of the region to dilate or contract
+                        region_thresh=50,  # if no region is given, the region is the pixels this dark or darker
+                        shape='disk'
                         ):
         """
         Given a region/filter to identify the region, dilate or contract this region.
-        Like the pupil of an eye!
+        Like the pupil of an eye! Pixels the region grows over take the color of the brightest region pixel within
+        amount of them, and pixels the region shrinks away from take the color of the brightest pixel outside of it
+        within amount, so every new color is one already in the image. Only the box around the changed pixels is
+        filled in, at the same cost per pixel for any amount (see utils.dilate).
+        :param amount: pixels to dilate the region by if positive, or to contract it by if negative
+        :param region: boolean array of shape (width, height), True inside the region
+        :param region_thresh: without a region, pixels with grayscale value (0-255) at most this are the region
+        :param shape: 'disk' or 'square', shape of the neighborhood the region grows or shrinks by; disks past a
+            radius of 5 pixels are approximated by an octagon just inside the disk
         :return:
         """
-        self.img.show()
-        edges = self.get_edges(contrast=1)
-        edges.show()
+        im, width, height, _ = self.get_array()
+        region = self._region_mask(im, region, region_thresh)
+        out = self.get_scratch(im)
+        self._dilate_contract_array(im, region, amount, shape, out=out)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, im)
         return
 
-    def stereogram(self):
+    def dilate_contract_frames(self,
+                               n_frames=20,
+                               amount=10,
+                               region=None,
+                               region_thresh=50,
+                               shape='disk',
+                               easing=easings.ease_in_out_sine,
+                               save=True):
+        """
+        Animate a pupil: the region dilates (or contracts, for a negative amount) out to amount and back again, so
+        the animation loops. The region is found once, and each distinct amount is only rendered once. See
+        dilate_contract() for parameters.
+        :param n_frames: number of frames in the loop
+        :param easing: easing function from 0 to 1 for the amount on the way out (and back, mirrored)
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im, width, height, _ = self.get_array()
+        region = self._region_mask(im, region, region_thresh)
+        # 0 -> 1 -> back toward 0, leaving off the last 0 so the loop doesn't repeat the first frame
+        progress = 1 - np.abs(1 - np.linspace(0, 2, n_frames, endpoint=False))
+        amounts = np.rint(amount * utils.eval_easing(easing, progress)).astype(int)
+        frames_by_amount = {}
+        out = np.empty_like(im)
+        frames = []
+        for frame_amount in amounts:
+            if frame_amount not in frames_by_amount:
+                self._dilate_contract_array(im, region, frame_amount, shape, out=out)
+                frames_by_amount[frame_amount] = utils.array_to_img_auto(out)
+            img = frames_by_amount[frame_amount]
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img.copy())
+        if not save:
+            return frames
+        return
+
+    @staticmethod
+    def _region_mask(im, region, region_thresh):
+        """
+        Get the region for dilate_contract(): the given region, or else the pixels of im at most region_thresh in
+        grayscale.
+        :return: boolean array of shape (width, height)
+        """
+        if region is not None:
+            region = np.asarray(region, dtype=bool)
+            if region.shape != im.shape[:2]:
+                raise Exception("Error: region must be the same size as the image.")
+            return region
+        grayscale = np.array(Image.fromarray(im if im.ndim == 2 else im[..., :3]).convert('L'))
+        return grayscale <= region_thresh
+
+    @staticmethod
+    def _dilate_contract_array(im, region, amount, shape, out=None):
+        """
+        Dilate or contract the region of pixel array im into out. See dilate_contract() for parameters.
+        :return: out
+        """
+        if out is None:
+            out = np.empty_like(im)
+        np.copyto(out, im)
+        radius = abs(int(round(amount)))
+        if radius == 0:
+            return out
+        if amount > 0:
+            changed = utils.dilate(region, radius, shape=shape) & ~region
+            source = region
+        else:
+            changed = region & ~utils.erode(region, radius, shape=shape)
+            source = ~region
+        if not changed.any():
+            return out
+        # only the changed pixels' bounding box, grown by radius to take in the source pixels they reach, matters
+        changed_rows, changed_cols = np.nonzero(changed)
+        box = (slice(max(changed_rows.min() - radius, 0), changed_rows.max() + radius + 1),
+               slice(max(changed_cols.min() - radius, 0), changed_cols.max() + radius + 1))
+        box_im = im[box]
+        box_changed = changed[box]
+        if box_im.ndim == 2:
+            luma = box_im
+        else:
+            luma = np.array(Image.fromarray(np.ascontiguousarray(box_im[..., :3])).convert('L'))
+        # pack each source pixel (the region when dilating, the outside when contracting) into one key, its
+        # luminance above its position in the box, so dilating the keys finds the brightest source pixel within
+        # radius of each changed pixel, and where it is; every changed pixel takes that pixel's color
+        positions = np.arange(luma.size, dtype=np.uint64).reshape(luma.shape)
+        keys = np.where(source[box], ((luma.astype(np.uint64) + 1) << np.uint64(32)) | positions, np.uint64(0))
+        picked = utils.dilate(keys, radius, shape=shape)[box_changed] & np.uint64(0xFFFFFFFF)
+        box_pixels = box_im.reshape((luma.size,) + box_im.shape[2:])
+        out[box][box_changed] = box_pixels[picked.astype(np.intp)]
+        return out
+
+    def stereogram(self,
+                   right_img=None,  # Pillow image for the right eye
+                   right_img_path='',  # or, path of the right eye image to load
+                   shift=None):  # pixels to slide the right eye image to the right
         """
         Give a left and right image, and jinx separate the red and cyan, define the shake amount.
+        Red-cyan anaglyph: the red channel comes from the current image (the left eye) and the green and blue
+        channels from the right eye image. Without a right eye image, the current image is used for both eyes, slid
+        apart by shift. The channels are written straight from the sources into one output array.
+        :param right_img: Pillow image for the right eye, the same size as the current image
+        :param right_img_path: or, path of the right eye image
+        :param shift: pixels to slide the right eye channels to the right (negative for left); defaults to 0 with a
+            right eye image, or 10 without one
         :return:
         """
+        left, right, shift = self._stereogram_sources(right_img, right_img_path, shift)
+        out = self.get_scratch(left)
+        self._stereogram_array(left, right, shift, out)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, left)
         return
 
-    def kuwahara(self):
+    def stereogram_frames(self,
+                          n_frames=10,
+                          shake=10,
+                          right_img=None,
+                          right_img_path='',
+                          shift=None,
+                          save=True):
+        """
+        Animate the anaglyph shaking: the right eye channels sway back and forth around shift by up to shake pixels,
+        and back again so the animation loops. The sources are only read once, each frame only slides the channel
+        views into the same output array. See stereogram() for parameters.
+        :param n_frames: number of frames in the loop
+        :param shake: max pixels the right eye channels sway away from shift
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        left, right, shift = self._stereogram_sources(right_img, right_img_path, shift)
+        out = np.empty_like(left)
+        frames = []
+        for frame_n in range(n_frames):
+            frame_shift = shift + int(round(shake * math.sin(2 * math.pi * frame_n / n_frames)))
+            self._stereogram_array(left, right, frame_shift, out)
+            img = utils.array_to_img_auto(out)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
         return
 
-    def swirl(self):
+    def _stereogram_sources(self, right_img, right_img_path, shift):
+        """
+        Get the left and right eye pixel arrays (RGB, or RGBA for the left eye if the current image has alpha) and the
+        default shift.
+        :return: left eye array, right eye array, shift
+        """
+        if right_img is not None and right_img_path != '':
+            raise Exception("Error: can only define right image from path or a Pillow image.")
+        if right_img_path != '':
+            right_img = Image.open(right_img_path)
+        left, width, height, image_colors = self.get_array()
+        if image_colors not in (3, 4):
+            left = np.array(self.img.convert('RGB'))
+        if right_img is None:
+            right = left
+            if shift is None:
+                shift = 10
+        else:
+            if right_img.mode not in ('RGB', 'RGBA'):
+                right_img = right_img.convert('RGB')
+            right = np.asarray(right_img)
+            if right.shape[:2] != left.shape[:2]:
+                raise Exception("Error: left and right images must be the same size.")
+            if shift is None:
+                shift = 0
+        return left, right, shift
+
+    @staticmethod
+    def _stereogram_array(left, right, shift, out):
+        """
+        Write the anaglyph of left and right into out: red (and any alpha) from left, green and blue from right slid
+        shift columns to the right, with the uncovered columns repeating the edge column.
+        :return: out
+        """
+        out[..., 0] = left[..., 0]
+        if left.shape[2] > 3:
+            out[..., 3:] = left[..., 3:]
+        shift = int(np.clip(shift, -(left.shape[1] - 1), left.shape[1] - 1))
+        if shift > 0:
+            out[:, shift:, 1:3] = right[:, :-shift, 1:3]
+            out[:, :shift, 1:3] = right[:, :1, 1:3]
+        elif shift < 0:
+            out[:, :shift, 1:3] = right[:, -shift:, 1:3]
+            out[:, shift:, 1:3] = right[:, -1:, 1:3]
+        else:
+            out[..., 1:3] = right[..., 1:3]
+        return out
+
+    def kuwahara(self,
+                 radius=5  # size of each of the 4 quadrants around a pixel, in pixels from the pixel
+                 ):
+        """
+        Painterly Kuwahara filter: each pixel becomes the mean color of whichever of the 4 quadrants around it
+        (top left, top right, bottom left, bottom right) has the least color variance, which smooths flat areas while
+        keeping edges sharp. Quadrant means and variances come from summed-area tables of the pixel values and
+        their squares, so each pixel costs the same whatever the radius; the image is filtered in bands of rows, so
+        the tables never take more memory than one band needs.
+        :param radius: each quadrant is (radius + 1) x (radius + 1) pixels, sharing the pixel's row and column
+        :return:
+        """
+        if radius < 1:
+            raise Exception("Error: kuwahara radius must be at least 1.")
+        im, width, height, _ = self.get_array()
+        out = self.get_scratch(im)
+        self._kuwahara_array(im, radius, out=out)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, im)
+        return
+
+    @staticmethod
+    def _kuwahara_array(im, radius, out=None):
+        """
+        Kuwahara filter the color channels of pixel array im (grayscale, RGB or RGBA) into out; any alpha channel is
+        copied over unchanged. See kuwahara() for parameters.
+        :return: out
+        """
+        if out is None:
+            out = np.empty_like(im)
+        color_im = im[..., np.newaxis] if im.ndim == 2 else im[..., :3]
+        width, height = im.shape[0], im.shape[1]
+        # pad with the edge pixels so quadrants near the border are full size
+        padded = np.pad(color_im, ((radius, radius), (radius, radius), (0, 0)), mode='edge')
+        window = radius + 1
+        n = window * window
+        # the 4 quadrants of pixel [i, j] start at [i, j], [i, j + r], [i + r, j] and [i + r, j + r] in the
+        # padded image, so each quadrant is one shifted slice of the window sums
+        corners = [(0, 0), (0, radius), (radius, 0), (radius, radius)]
+        # work through the image in bands of rows, so the int64 sums only ever cover one band
+        band_width = max(1, 2 ** 18 // height)
+        means = np.empty(color_im.shape, dtype=np.uint8)
+        for x0 in range(0, width, band_width):
+            x1 = min(x0 + band_width, width)
+            band = padded[x0:x1 + 2 * radius]
+            # sums of every window x window square of values and squared values in the band, per channel
+            sums = utils.window_sums(utils.summed_area_table(band), window)
+            square_sums = utils.window_sums(utils.summed_area_table(np.square(band, dtype=np.uint16)), window)
+            # one quadrant at a time, keep the sums of the quadrant with the least spread so far
+            best_spread = None
+            best_sums = None
+            for x, y in corners:
+                quadrant_sums = sums[x:x + x1 - x0, y:y + height]
+                quadrant_square_sums = square_sums[x:x + x1 - x0, y:y + height]
+                # n^2 x variance, summed over the color channels (exact in integers, and same order as the variance)
+                spread = (n * quadrant_square_sums - quadrant_sums * quadrant_sums).sum(axis=-1)
+                if best_spread is None:
+                    best_spread = spread
+                    best_sums = quadrant_sums.copy()
+                    continue
+                # strictly less, so ties go to the earlier quadrant
+                better = spread < best_spread
+                best_spread[better] = spread[better]
+                best_sums[better] = quadrant_sums[better]
+            # rounded mean of the chosen quadrant
+            means[x0:x1] = (best_sums + n // 2) // n
+        if im.ndim == 2:
+            out[...] = means[..., 0]
+        else:
+            out[..., :3] = means
+            if im.shape[2] > 3:
+                out[..., 3:] = im[..., 3:]
+        return out
+
+    def swirl(self,
+              strength=5,  # radians to turn the center of the swirl
+              radius=None,  # extent of the swirl, in pixels
+              center=None,  # (x, y) array index of the swirl center
+              sampling='bilinear'):
+        """
+        Twist the image around a center point, turning most in the middle and fading out with distance.
+        :param strength: turn at the center, in radians; negative to swirl the other way
+        :param radius: extent of the swirl in pixels, the turn halves every radius / 5 pixels from the center.
+            Defaults to half the smaller side of the image
+        :param center: (x, y) array index of the swirl center, defaults to the middle of the image
+        :param sampling: 'nearest' for the closest source pixel (faster, blocky), or 'bilinear' for smooth blending
+        :return:
+        """
+        im, width, height, _ = self.get_array()
+        src_rows, src_cols = self._swirl_remap(im.shape[:2], strength, radius, center)
+        out = self.get_scratch(im)
+        utils.remap(im, src_rows, src_cols, sampling=sampling, out=out)
+        # set back onto this instance, keeping the old array as the next scratch buffer
+        self.swap_scratch(out, im)
         return
 
-    def glitch(self):
+    def swirl_frames(self,
+                     n_frames=20,
+                     strength=5,
+                     radius=None,
+                     center=None,
+                     sampling='bilinear',
+                     easing=easings.ease_in_out_sine,
+                     save=True):
+        """
+        Animate the swirl tightening: strength eases from 0 on the first frame to strength on the last one, each
+        frame swirling the current image. The strength-independent part of the remap table is only computed once
+        (see utils.swirl_polar), and every frame's table is written into the same buffers. See swirl() for
+        parameters.
+        :param n_frames: number of frames
+        :param easing: easing function from 0 to 1 for the strength over the frames
+        :param save: if True, save each frame with save_frame(); if False, return the list of frames instead
+        :return: list of Pillow images if save is False
+        """
+        im, width, height, _ = self.get_array()
+        progress = np.linspace(0, 1, n_frames) if n_frames > 1 else np.ones(1)
+        strengths = strength * utils.eval_easing(easing, progress)
+        # reuse the same remap table and output buffers every frame
+        table = (np.empty(im.shape[:2], dtype=np.float32), np.empty(im.shape[:2], dtype=np.float32))
+        out = np.empty_like(im)
+        frames = []
+        for frame_strength in strengths:
+            src_rows, src_cols = self._swirl_remap(im.shape[:2], float(frame_strength), radius, center, out=table)
+            utils.remap(im, src_rows, src_cols, sampling=sampling, out=out)
+            img = utils.array_to_img_auto(out)
+            if save:
+                self.save_frame(img)
+            else:
+                frames.append(img)
+        if not save:
+            return frames
         return
 
+    @staticmethod
+    def _swirl_remap(shape, strength, radius, center, out=None):
+        """
+        Fill in the default radius and center of a swirl, and get its remap table.
+        :param out: optional (source rows, source columns) float32 arrays to write the table into
+        :return: source rows, source columns
+        """
+        if radius is None:
+            radius = min(shape) / 2
+        if center is None:
+            center = ((shape[0] - 1) / 2, (shape[1] - 1) / 2)
+        if radius <= 0:
+            raise Exception("Error: swirl radius must be positive.")
+        return utils.swirl_remap(tuple(shape), tuple(float(c) for c in center), float(radius), float(strength),
+                                 out=out)
+
     def stripe(self):
         return
 
@@ -1,9 +1,13 @@
+import functools
+import math
+import hashlib
 import matplotlib.pyplot as plt
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageDraw, ImageFont
 import pyautogui
 from shapely import geometry
 import time
+from . import easings
 
 # lock aspect ratio 1:1 x:y for all plots
 plt.axes().set_aspect('equal')
@@ -29,6 +33,14 @@ def array_from_img(im):
     return im_arr, image_width, image_height, image_colors
 
 
+def array_digest(arr):
+    """
+    Hash the pixels of an array, to use as a cache key for results computed from an image.
+    :return: hex digest string
+    """
+    return hashlib.blake2b(np.ascontiguousarray(arr).data, digest_size=16).hexdigest()
+
+
 def angle_degrees(angle):
     """
     Convert angle (degrees) from any integer to between 0-360 degrees.
@@ -47,6 +59,681 @@ def array_to_img_rgba(arr):
     return Image.fromarray(arr.astype('uint8'), 'RGBA')
 
 
+def array_to_img_auto(arr):
+    """
+    Convert a pixel array to a Pillow image, picking the mode from the number of color channels.
+    """
+    if arr.ndim == 2:
+        return Image.fromarray(arr.astype('uint8'), 'L')
+    if arr.shape[2] == 4:
+        return array_to_img_rgba(arr)
+    return array_to_img(arr)
+
+
+def color_palette(pixel_colors, n_fuzzies=0):
+    """
+    Build a uint8 palette table (n colors, 3) from a list of [R, G, B] colors.
+    :param pixel_colors: list of [R, G, B] colors
+    :param n_fuzzies: number of colors to interpolate between each sequential pair of given colors,
+        i.e. 2 adds 2 in-between colors to the palette for each pair
+    :return: array of unique colors, shape (n colors, 3), dtype uint8
+    """
+    given_colors = np.array(pixel_colors, dtype=float)
+    palette = [given_colors]
+    if n_fuzzies > 0 and len(given_colors) > 1:
+        # evenly spaced steps between each color and the next, not including the colors themselves
+        steps = np.linspace(0, 1, num=n_fuzzies + 2)[1:-1]
+        starts = given_colors[:-1, np.newaxis, :]
+        ends = given_colors[1:, np.newaxis, :]
+        fuzzy_colors = starts + (ends - starts) * steps[np.newaxis, :, np.newaxis]
+        palette.append(fuzzy_colors.reshape(-1, 3))
+    palette = np.concatenate(palette).round().astype('uint8')
+    # remove duplicates
+    return np.unique(palette, axis=0)
+
+
+def eval_easing(easing, xs):
+    """
+    Evaluate an easing function over a whole array of x values at once. Easings written with numpy-friendly math
+    (i.e. x * x) are called once on the array; easings that only handle one number at a time (i.e. math.sin, or
+    if/else branches) fall back to being vectorized by numpy.
+    :param easing: easing function
+    :param xs: array of x values
+    :return: array of y values, same shape as xs
+    """
+    xs = np.asarray(xs, dtype=float)
+    try:
+        ys = np.asarray(easing(xs), dtype=float)
+        if ys.shape == xs.shape:
+            return ys
+    except (TypeError, ValueError):
+        pass
+    return np.vectorize(easing, otypes=[float])(xs)
+
+
+def summed_area_table(arr):
+    """
+    Summed-area table (integral image) of an array over its first two axes, with a leading row and column of zeros so
+    that the sum of any rectangle of arr is 4 lookups (see window_sums()). Sums are int64, so uint8 images (and their
+    squares) are summed exactly.
+    :param arr: array of shape (n rows, n columns, ...)
+    :return: int64 array of shape (n rows + 1, n columns + 1, ...)
+    """
+    sat = np.zeros((arr.shape[0] + 1, arr.shape[1] + 1) + arr.shape[2:], dtype=np.int64)
+    np.cumsum(arr, axis=0, dtype=np.int64, out=sat[1:, 1:])
+    np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+    return sat
+
+
+def window_sums(sat, window):
+    """
+    Sum of every window x window square of the array a summed_area_table() was made from, all at once.
+    :param sat: summed-area table from summed_area_table()
+    :param window: side length of the square, in pixels
+    :return: array where [i, j] is the sum of the square with top left corner [i, j], of shape
+        (n rows - window + 1, n columns - window + 1, ...)
+    """
+    return sat[window:, window:] - sat[:-window, window:] - sat[window:, :-window] + sat[:-window, :-window]
+
+
+@functools.lru_cache(maxsize=32)
+def radial_alpha_mask(shape, r_min_fraction=1. / 3, r_max_fraction=0.8, easing=easings.ease_out_linear):
+    """
+    Alpha mask that is opaque in the middle and fades out radially toward the corners, used by
+    Sorceress.alpha_border(). Results are kept in an LRU cache keyed by all arguments, so the returned array is
+    read-only; copy it if you need to change it. Call radial_alpha_mask.cache_info() to inspect the cache and
+    radial_alpha_mask.cache_clear() to empty it.
+    :param shape: (n rows, n columns) of the mask
+    :param r_min_fraction: fraction of the center-to-corner radius within which the mask is fully opaque
+    :param r_max_fraction: fraction of the center-to-corner radius past which the mask is fully transparent
+    :param easing: easing function for the fade between r_min and r_max
+    :return: uint8 array of shape (n rows, n columns)
+    """
+    l_row, l_col = shape
+    rows, cols = np.mgrid[:l_row, :l_col]
+    radius = np.sqrt((rows - l_row / 2) ** 2 + (cols - l_col / 2) ** 2)
+    alpha_channel = np.zeros((l_row, l_col))
+    r_min, r_max = r_min_fraction * radius.max(), r_max_fraction * radius.max()
+    alpha_channel[radius < r_min] = 1
+    alpha_channel[radius > r_max] = 0
+    gradient_zone = np.logical_and(radius >= r_min, radius <= r_max)
+    alpha_channel[gradient_zone] = eval_easing(easing, (r_max - radius[gradient_zone]) / (r_max - r_min))
+    alpha_channel *= 255
+    alpha_channel = alpha_channel.astype(np.uint8)
+    alpha_channel.flags.writeable = False
+    return alpha_channel
+
+
+@functools.lru_cache(maxsize=64)
+def load_font(font_path, size):
+    """
+    Load a TrueType font, parsing each (font_path, size) only once per process.
+    :return: Pillow FreeTypeFont
+    """
+    return ImageFont.truetype(font_path, size)
+
+
+@functools.lru_cache(maxsize=256)
+def text_sprite(text, font_path, size, color):
+    """
+    Pre-render text into a transparent RGBA sprite, cropped to the text's bounding box. Cached, so the same text
+    is only rasterized once; paste it with the sprite as its own mask.
+    :param color: color tuple
+    :return: (RGBA Pillow image, (x, y) offset of the sprite from the location the text was drawn at)
+    """
+    font = load_font(font_path, size)
+    left, top, right, bottom = font.getbbox(text)
+    sprite = Image.new('RGBA', (max(right - left, 1), max(bottom - top, 1)), (*color[:3], 0))
+    draw = ImageDraw.Draw(sprite)
+    draw.text((-left, -top), text, color, font)
+    return sprite, (left, top)
+
+
+def paste_sprite_array(arr, sprite, loc):
+    """
+    Alpha-blend an RGBA sprite onto a pixel array in place, like Pillow's img.paste(sprite, loc, sprite) but without
+    leaving numpy. On RGBA arrays the sprite also makes the pixels under it more opaque, as drawing on them with
+    Pillow does.
+    :param arr: uint8 RGB or RGBA pixel array
+    :param sprite: RGBA Pillow image or array
+    :param loc: (x, y) Pillow coordinates (column, row) of the sprite's top left corner
+    :return: arr
+    """
+    sprite = np.asarray(sprite)
+    col, row = loc
+    # clip the sprite to the array bounds
+    r0, c0 = max(row, 0), max(col, 0)
+    r1, c1 = min(row + sprite.shape[0], arr.shape[0]), min(col + sprite.shape[1], arr.shape[1])
+    if r0 >= r1 or c0 >= c1:
+        return arr
+    sprite = sprite[r0 - row:r1 - row, c0 - col:c1 - col]
+    alpha = sprite[..., 3:4].astype(np.uint16)
+    region = arr[r0:r1, c0:c1, :3]
+    blended = (sprite[..., :3] * alpha + region * (255 - alpha) + 127) // 255
+    if arr.shape[-1] == 4:
+        region_alpha = arr[r0:r1, c0:c1, 3:4]
+        # like Pillow, fully transparent pixels the sprite covers at all just take its color
+        blended = np.where((region_alpha == 0) & (alpha > 0), sprite[..., :3], blended)
+        # a_out = a_sprite + a_dest * (255 - a_sprite) / 255
+        region_alpha[...] = alpha + (region_alpha * (255 - alpha) + 127) // 255
+    region[...] = blended
+    return arr
+
+
+@functools.lru_cache(maxsize=32)
+def polar_grid(shape, center):
+    """
+    Distance and angle of every pixel from a center point. Cached by (shape, center), so the returned arrays are
+    read-only.
+    :param shape: (n rows, n columns)
+    :param center: (x, y) array index (row, column) of the center, may be fractional
+    :return: (radius, angle in radians from the row axis toward the column axis), float arrays of shape
+    """
+    rows, cols = np.indices(shape, dtype=float)
+    d_rows, d_cols = rows - center[0], cols - center[1]
+    radius = np.hypot(d_rows, d_cols)
+    angle = np.arctan2(d_cols, d_rows)
+    radius.flags.writeable = False
+    angle.flags.writeable = False
+    return radius, angle
+
+
+@functools.lru_cache(maxsize=32)
+def ring_coords(shape, center, inner_radius, outer_radius):
+    """
+    Polar coordinates of the pixels in a ring (donut), as in Sorceress.snake(). Cached by all arguments, so the
+    returned arrays are read-only.
+    :param shape: (n rows, n columns)
+    :param center: (x, y) array index of the ring center
+    :return: (rows, columns) of the pixels in the ring, their radius, and their angle clockwise on screen from the
+        bottom of the ring, as a fraction of a turn (0 to 1)
+    """
+    rho, theta = polar_grid(shape, center)
+    rows, cols = np.nonzero((rho >= inner_radius) & (rho <= outer_radius))
+    ring_rho = rho[rows, cols]
+    turn = (-theta[rows, cols] / (2 * np.pi)) % 1
+    for ring_arr in (rows, cols, ring_rho, turn):
+        ring_arr.flags.writeable = False
+    return rows, cols, ring_rho, turn
+
+
+@functools.lru_cache(maxsize=64)
+def gradient_ramp(shape, kind='linear', easing=easings.ease_out_linear, angle=0, center=None):
+    """
+    Gradient ramp from 0 to 1 over an image, as in Sorceress.gradient(). Axis-aligned linear ramps are kept 1-D, as
+    a single column (n rows, 1) or row (1, n columns), to broadcast across the image. Cached by all arguments, so
+    the returned array is read-only.
+    :param shape: (n rows, n columns)
+    :param kind: 'linear' (along angle), 'radial' (out from center to the farthest corner) or 'angular' (around
+        center, starting at angle)
+    :param easing: easing function applied to the ramp
+    :param angle: degrees counterclockwise from pointing right, for linear and angular ramps
+    :param center: (x, y) array index of the center of radial and angular ramps, defaults to the middle
+    :return: float32 array, broadcastable to shape
+    """
+    l_row, l_col = shape
+    if kind == 'linear':
+        rads = math.radians(angle)
+        # direction of the ramp in (row, column), with rows going down the screen
+        d_row, d_col = round(-math.sin(rads), 12), round(math.cos(rads), 12)
+        rows = np.arange(l_row, dtype=float)[:, np.newaxis] * d_row
+        cols = np.arange(l_col, dtype=float)[np.newaxis, :] * d_col
+        # axis-aligned ramps only vary along one axis, keep them 1-D
+        if d_row == 0:
+            ramp = cols
+        elif d_col == 0:
+            ramp = rows
+        else:
+            ramp = rows + cols
+        ramp = ramp - ramp.min()
+        if ramp.max() > 0:
+            ramp /= ramp.max()
+    elif kind in ['radial', 'angular']:
+        if center is None:
+            center = ((l_row - 1) / 2, (l_col - 1) / 2)
+        rho, theta = polar_grid(tuple(shape), tuple(center))
+        if kind == 'radial':
+            ramp = rho / max(rho.max(), 1)
+        else:
+            # polar_grid angles go from the row axis (down) toward the column axis (right), i.e. counterclockwise
+            # from pointing down
+            ramp = ((np.degrees(theta) - 90 - angle) / 360) % 1
+    else:
+        raise Exception("Error: unable to understand gradient kind, was expecting 'linear', 'radial' or 'angular'.")
+    ramp = eval_easing(easing, ramp).astype(np.float32)
+    ramp.flags.writeable = False
+    return ramp
+
+
+@functools.lru_cache(maxsize=32)
+def light_kernel(radius, easing=easings.ease_in_quad):
+    """
+    Falloff of a point light, as in Sorceress.glare(): 1 at the middle, easing down to 0 at radius pixels away. Cached
+    by (radius, easing), so the returned array is read-only.
+    :param radius: radius of the light, in pixels
+    :param easing: easing function from 0 (edge of the light) to 1 (middle)
+    :return: float32 array of shape (2 * radius + 1, 2 * radius + 1)
+    """
+    rho, _ = polar_grid((2 * radius + 1, 2 * radius + 1), (radius, radius))
+    closeness = np.clip(1 - rho / max(radius, 1), 0, 1)
+    kernel = np.clip(eval_easing(easing, closeness), 0, 1).astype(np.float32)
+    kernel[closeness <= 0] = 0
+    kernel.flags.writeable = False
+    return kernel
+
+
+@functools.lru_cache(maxsize=8)
+def swirl_polar(shape, center, radius):
+    """
+    The part of a swirl's remap table that doesn't depend on its strength: distance and angle of every pixel from the
+    center, and the fraction of the strength each pixel turns by, which halves every radius / 5 pixels out from the
+    center. Cached by all arguments, so animating a swirl's strength or swirling many same-size images computes these
+    once; the returned arrays are read-only.
+    :param shape: (n rows, n columns)
+    :param center: (x, y) array index of the swirl center
+    :param radius: extent of the swirl, in pixels
+    :return: (radius, angle in radians from the row axis toward the column axis, falloff), float32 arrays of shape
+    """
+    d_rows = np.arange(shape[0], dtype=np.float32)[:, np.newaxis] - np.float32(center[0])
+    d_cols = np.arange(shape[1], dtype=np.float32)[np.newaxis, :] - np.float32(center[1])
+    rho = np.hypot(d_rows, d_cols)
+    theta = np.arctan2(d_cols, d_rows)
+    falloff = np.exp2(-rho / np.float32(radius / 5))
+    for arr in (rho, theta, falloff):
+        arr.flags.writeable = False
+    return rho, theta, falloff
+
+
+def swirl_remap(shape, center, radius, strength, out=None):
+    """
+    Remap table of a swirl: for every output pixel, the (fractional) source pixel to sample, as in
+    Sorceress.swirl(). Pixels are turned around the center by strength radians, falling off with distance so the
+    turn halves every radius / 5 pixels (see swirl_polar(), which is cached). Sample it with remap().
+    :param shape: (n rows, n columns)
+    :param center: (x, y) array index of the swirl center
+    :param radius: extent of the swirl, in pixels
+    :param strength: turn at the center, in radians
+    :param out: optional (source rows, source columns) float32 arrays of shape to write into
+    :return: (source rows, source columns), float32 arrays of shape
+    """
+    rho, theta, falloff = swirl_polar(shape, center, radius)
+    if out is None:
+        out = (np.empty(shape, dtype=np.float32), np.empty(shape, dtype=np.float32))
+    src_rows, src_cols = out
+    turned = falloff * np.float32(strength)
+    turned += theta
+    np.cos(turned, out=src_rows)
+    src_rows *= rho
+    src_rows += np.float32(center[0])
+    np.sin(turned, out=src_cols)
+    src_cols *= rho
+    src_cols += np.float32(center[1])
+    return src_rows, src_cols
+
+
+def remap(arr, src_rows, src_cols, sampling='bilinear', out=None):
+    """
+    Build a new image by sampling arr at the given source coordinates; coordinates outside arr take the nearest edge
+    pixel.
+    :param arr: uint8 pixel array, with or without a color dimension
+    :param src_rows: float array of source rows, one per output pixel
+    :param src_cols: float array of source columns, same shape as src_rows
+    :param sampling: 'nearest' to take the closest pixel, or 'bilinear' to blend the 4 surrounding pixels
+    :param out: optional uint8 array to write into, of shape src_rows.shape + arr.shape[2:]
+    :return: out
+    """
+    if out is None:
+        out = np.empty(src_rows.shape + arr.shape[2:], dtype=np.uint8)
+    if sampling not in ('nearest', 'bilinear'):
+        raise Exception("Error: unable to understand sampling, was expecting 'nearest' or 'bilinear'.")
+    # sample in bands along the first axis, so the index and weight arrays only ever cover one band
+    band_width = max(1, 2 ** 18 * max(src_rows.shape[0], 1) // max(src_rows.size, 1))
+    for x0 in range(0, src_rows.shape[0], band_width):
+        x1 = x0 + band_width
+        remap_band(arr, src_rows[x0:x1], src_cols[x0:x1], sampling, out[x0:x1])
+    return out
+
+
+def remap_band(arr, src_rows, src_cols, sampling, out):
+    """
+    remap() one band of source coordinates into out.
+    :return:
+    """
+    max_row, max_col = arr.shape[0] - 1, arr.shape[1] - 1
+    if sampling == 'nearest':
+        rows = np.clip(np.rint(src_rows), 0, max_row).astype(np.intp)
+        cols = np.clip(np.rint(src_cols), 0, max_col).astype(np.intp)
+        out[...] = arr[rows, cols]
+        return
+    src_rows = np.clip(src_rows, 0, max_row)
+    src_cols = np.clip(src_cols, 0, max_col)
+    # top left pixel of the 4 to blend, kept one away from the last row/column so the bottom right one exists
+    rows = np.minimum(src_rows.astype(np.intp), max(max_row - 1, 0))
+    cols = np.minimum(src_cols.astype(np.intp), max(max_col - 1, 0))
+    rows_1, cols_1 = np.minimum(rows + 1, max_row), np.minimum(cols + 1, max_col)
+    row_weights = (src_rows - rows).astype(np.float32)
+    col_weights = (src_cols - cols).astype(np.float32)
+    if arr.ndim == 3:
+        row_weights, col_weights = row_weights[..., np.newaxis], col_weights[..., np.newaxis]
+    top = arr[rows, cols] * (1 - col_weights) + arr[rows, cols_1] * col_weights
+    bottom = arr[rows_1, cols] * (1 - col_weights) + arr[rows_1, cols_1] * col_weights
+    np.rint(top * (1 - row_weights) + bottom * row_weights, out=top)
+    np.clip(top, 0, 255, out=top)
+    out[...] = top
+    return
+
+
+def running_max(arr, radius, axis=0):
+    """
+    Max over the window of 2 * radius + 1 elements centered on every element along one axis, using the van
+    Herk/Gil-Werman algorithm: about 3 comparisons per element whatever the radius. Elements past the ends of the axis
+    count as 0.
+    :param arr: unsigned integer (or bool) array
+    :param radius: window radius, in elements
+    :param axis: axis to run along
+    :return: new array, same shape as arr
+    """
+    if radius <= 0:
+        return arr.copy()
+    arr = np.moveaxis(arr, axis, 0)
+    n = arr.shape[0]
+    window = 2 * radius + 1
+    # pad both ends by radius, and the end up to a whole number of windows, so every window spans at most 2 blocks
+    n_blocks = -(-(n + 2 * radius) // window)
+    padded = np.zeros((n_blocks * window,) + arr.shape[1:], dtype=arr.dtype)
+    padded[radius:radius + n] = arr
+    blocks = padded.reshape((n_blocks, window) + arr.shape[1:])
+    # running max from the start of each block, and from the end of each block
+    prefix_max = np.maximum.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix_max = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    out = np.maximum(suffix_max[:n], prefix_max[window - 1:window - 1 + n])
+    return np.moveaxis(out, 0, axis)
+
+
+def diagonal_running_max(arr, radius, direction=1):
+    """
+    running_max() along the diagonals of the first two axes, by skewing the array so each diagonal becomes a column.
+    :param direction: 1 for the diagonal going down and right, -1 for the one going down and left
+    :return: new array, same shape as arr
+    """
+    n_rows, n_cols = arr.shape[0], arr.shape[1]
+
+    def skew_view(skewed, writeable=False):
+        # view of skewed where [i, j] is skewed[i, j + n_rows - 1 - i] (direction 1) or skewed[i, j + i] (direction -1)
+        row_stride, col_stride = skewed.strides[0], skewed.strides[1]
+        if direction == 1:
+            skewed = skewed[:, n_rows - 1:]
+            row_stride -= col_stride
+        else:
+            row_stride += col_stride
+        return np.lib.stride_tricks.as_strided(
+            skewed, shape=arr.shape, strides=(row_stride, col_stride) + skewed.strides[2:], writeable=writeable
+        )
+
+    skewed = np.zeros((n_rows, n_rows + n_cols - 1) + arr.shape[2:], dtype=arr.dtype)
+    skew_view(skewed, writeable=True)[...] = arr
+    return skew_view(running_max(skewed, radius, axis=0)).copy()
+
+
+def dilate(arr, radius, shape='square'):
+    """
+    Morphological dilation (max filter) of an unsigned integer or bool array over its first two axes, at any radius,
+    with each channel dilated on its own. Pixels outside the array count as 0. Both shapes cost the same per pixel
+    whatever the radius.
+    :param radius: radius of the structuring element, in pixels
+    :param shape: 'square' for a (2 * radius + 1) square, or 'disk' for the pixels within radius of the center. Disks
+        up to a radius of 5 are exact; bigger ones are approximated by the biggest octagon inside the disk (a square,
+        then both diagonals, see inscribed_octagon()), which covers about 90% of it and never reaches past it
+    :return: new array, same shape as arr
+    """
+    if radius <= 0:
+        return arr.copy()
+    if shape == 'square':
+        return running_max(running_max(arr, radius, axis=0), radius, axis=1)
+    if shape != 'disk':
+        raise Exception("Error: unable to understand shape, was expecting 'square' or 'disk'.")
+    if radius <= 5:
+        return dilate_chords(arr, radius)
+    a, b = inscribed_octagon(radius)
+    # pad by the reach of the diagonals, so square-dilated pixels just outside the array still reach back into it
+    n_rows, n_cols = arr.shape[0], arr.shape[1]
+    pad = 2 * b
+    out = np.zeros((n_rows + 2 * pad, n_cols + 2 * pad) + arr.shape[2:], dtype=arr.dtype)
+    out[pad:pad + n_rows, pad:pad + n_cols] = arr
+    out = dilate(out, a, shape='square')
+    out = diagonal_running_max(out, b, direction=1)
+    out = diagonal_running_max(out, b, direction=-1)
+    return out[pad:pad + n_rows, pad:pad + n_cols].copy()
+
+
+@functools.lru_cache(maxsize=None)
+def inscribed_octagon(radius):
+    """
+    Size of the biggest octagon dilate() can build that stays inside a disk: a square of half side a, then a segment
+    of b steps along each diagonal, which puts the octagon's corners at (a + 2b, a) and its mirror images.
+    :return: a, b
+    """
+    best = (1, 0)
+    best_area = 0
+    for a in range(1, radius + 1):
+        # longest diagonals that keep the corners within radius
+        b = int((math.sqrt(radius * radius - a * a) - a) // 2)
+        if b < 0:
+            break
+        # the square of half side a + 2b, less its 4 corner triangles with legs 2b
+        area = 4 * (a + 2 * b) ** 2 - 8 * b * b
+        if area > best_area:
+            best, best_area = (a, b), area
+    return best
+
+
+def dilate_chords(arr, radius):
+    """
+    dilate() with an exact disk, as a stack of row chords: one running max per distinct chord width, so the cost per
+    pixel grows with the radius.
+    :return: new array, same shape as arr
+    """
+    # row offsets of the disk by the half width of their chord
+    chord_rows = {}
+    for d_row in range(-radius, radius + 1):
+        chord_rows.setdefault(math.isqrt(radius * radius - d_row * d_row), []).append(d_row)
+    n_rows = arr.shape[0]
+    out = np.zeros_like(arr)
+    for half_width, d_rows in chord_rows.items():
+        # max along each row over the chord, then max it into every row offset with a chord this wide
+        row_max = running_max(arr, half_width, axis=1)
+        for d_row in d_rows:
+            if d_row >= 0:
+                np.maximum(out[:n_rows - d_row], row_max[d_row:], out=out[:n_rows - d_row])
+            else:
+                np.maximum(out[-d_row:], row_max[:d_row], out=out[-d_row:])
+    return out
+
+
+def erode(arr, radius, shape='square'):
+    """
+    Morphological erosion (min filter) of a uint8 or bool array, the opposite of dilate(). Pixels outside the array
+    count as the max value, so shapes touching the border don't erode from it.
+    :return: new array, same shape as arr
+    """
+    if arr.dtype == bool:
+        return ~dilate(~arr, radius, shape=shape)
+    return 255 - dilate(255 - arr, radius, shape=shape)
+
+
+def grid_index(points, cell_size):
+    """
+    Uniform grid spatial index of 2-D points: the points bucketed into cell_size x cell_size cells and sorted by cell,
+    so the points near any location are found by binary search instead of checking every point. Query it with
+    grid_pairs().
+    :param points: float array of shape (n points, 2)
+    :param cell_size: side of the cells, at least the largest distance the index will be queried with
+    :return: index tuple
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    cells = np.floor(points / cell_size).astype(np.int64)
+    if len(points) == 0:
+        origin, n_cells = np.zeros(2, dtype=np.int64), np.ones(2, dtype=np.int64)
+    else:
+        origin = cells.min(axis=0)
+        n_cells = cells.max(axis=0) - origin + 1
+    keys = (cells[:, 0] - origin[0]) * n_cells[1] + (cells[:, 1] - origin[1])
+    order = np.argsort(keys, kind='stable')
+    return points, cell_size, origin, n_cells, order, keys[order]
+
+
+def grid_pairs(index, queries, max_dist):
+    """
+    Every pair of a query point and an indexed point within max_dist of each other, found by only checking the
+    points in each query's own and 8 surrounding grid cells.
+    :param index: from grid_index(), with cell size at least max_dist
+    :param queries: float array of shape (n queries, 2)
+    :param max_dist: search radius
+    :return: (query index, point index, distance) of each pair, as flat arrays
+    """
+    points, cell_size, origin, n_cells, order, sorted_keys = index
+    queries = np.asarray(queries, dtype=float).reshape(-1, 2)
+    query_cells = np.floor(queries / cell_size).astype(np.int64) - origin
+    pair_queries, pair_points = [], []
+    for d_row in (-1, 0, 1):
+        for d_col in (-1, 0, 1):
+            cells = query_cells + (d_row, d_col)
+            in_grid = np.all((cells >= 0) & (cells < n_cells), axis=1)
+            keys = cells[:, 0] * n_cells[1] + cells[:, 1]
+            starts = np.searchsorted(sorted_keys, keys, side='left')
+            counts = np.where(in_grid, np.searchsorted(sorted_keys, keys, side='right') - starts, 0)
+            n_pairs = counts.sum()
+            if n_pairs == 0:
+                continue
+            # position of each pair within its query's run of points
+            run_pos = np.arange(n_pairs) - np.repeat(np.cumsum(counts) - counts, counts)
+            pair_queries.append(np.repeat(np.arange(len(queries)), counts))
+            pair_points.append(order[np.repeat(starts, counts) + run_pos])
+    if not pair_queries:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+    pair_queries, pair_points = np.concatenate(pair_queries), np.concatenate(pair_points)
+    dist = np.hypot(*(points[pair_points] - queries[pair_queries]).T)
+    in_reach = dist <= max_dist
+    return pair_queries[in_reach], pair_points[in_reach], dist[in_reach]
+
+
+def closest_per_key(keys, values, dist):
+    """
+    The closest pair of each key that has any pairs, i.e. from grid_pairs(). Costs as much as there are pairs, however
+    many keys there could be.
+    :return: (each key with pairs, the value of its closest pair, its distance), sorted by key
+    """
+    # sort by key then distance, keep the first of each key
+    pair_order = np.lexsort((dist, keys))
+    keys, values, dist = keys[pair_order], values[pair_order], dist[pair_order]
+    is_first = np.ones(len(keys), dtype=bool)
+    is_first[1:] = keys[1:] != keys[:-1]
+    return keys[is_first], values[is_first], dist[is_first]
+
+
+def closest_pairs(keys, values, dist, n_keys):
+    """
+    For each key, the value of its closest pair, i.e. from grid_pairs().
+    :return: (value of the closest pair or -1 if the key has none, its distance or inf), one per key
+    """
+    closest = np.full(n_keys, -1, dtype=np.intp)
+    closest_dist = np.full(n_keys, np.inf)
+    paired_keys, closest_values, closest_dists = closest_per_key(keys, values, dist)
+    closest[paired_keys] = closest_values
+    closest_dist[paired_keys] = closest_dists
+    return closest, closest_dist
+
+
+def grid_nearest(points, queries, max_dist):
+    """
+    For every query point, the nearest of points within max_dist, using a uniform grid spatial index (see
+    grid_index()).
+    :param points: float array of shape (n points, 2)
+    :param queries: float array of shape (n queries, 2)
+    :param max_dist: search radius
+    :return: (index of the nearest point or -1 if none is within max_dist, its distance or inf), one per query
+    """
+    pair_queries, pair_points, dist = grid_pairs(grid_index(points, max_dist), queries, max_dist)
+    return closest_pairs(pair_queries, pair_points, dist, len(np.asarray(queries).reshape(-1, 2)))
+
+
+@functools.lru_cache(maxsize=32)
+def disk_offsets(radius):
+    """
+    (row, column) offsets of the pixels within radius of a pixel, to stamp disks with.
+    :return: read-only int array of shape (n pixels in the disk, 2)
+    """
+    rows, cols = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    in_disk = rows ** 2 + cols ** 2 <= radius ** 2 + radius
+    offsets = np.stack([rows[in_disk], cols[in_disk]], axis=1)
+    offsets.flags.writeable = False
+    return offsets
+
+
+@functools.lru_cache(maxsize=32)
+def noise_tile(octaves=4, scale=4, seed=0, size=256):
+    """
+    Tileable value noise, as used by Sorceress.scuff() and Sorceress.banner(): the sum of octaves layers of random
+    values on a grid, smoothly interpolated, each layer with twice the detail and half the strength of the last.
+    The grids wrap around, so the tile repeats seamlessly. Cached by all arguments, making a bank of textures that
+    are only generated once per process; the returned array is read-only. Sample it with noise_lookup().
+    :param octaves: number of layers of detail
+    :param scale: number of grid cells across the tile in the first layer (bigger for smaller blotches)
+    :param seed: seed for numpy's random Generator
+    :param size: side of the square tile, in pixels
+    :return: float32 array of shape (size, size), from 0 to 1
+    """
+    rng = np.random.default_rng(seed)
+    tile = np.zeros((size, size))
+    amplitude = 1.
+    for octave in range(octaves):
+        n_cells = min(scale * 2 ** octave, size)
+        grid = rng.random((n_cells, n_cells))
+        # grid cell and smoothstepped position within it of every pixel along a side, the same for rows and columns
+        cell_pos = np.arange(size) * n_cells / size
+        cells = cell_pos.astype(int)
+        next_cells = (cells + 1) % n_cells
+        frac = cell_pos - cells
+        frac = frac * frac * (3 - 2 * frac)
+        top = grid[np.ix_(cells, cells)] * (1 - frac) + grid[np.ix_(cells, next_cells)] * frac
+        bottom = grid[np.ix_(next_cells, cells)] * (1 - frac) + grid[np.ix_(next_cells, next_cells)] * frac
+        tile += amplitude * (top * (1 - frac)[:, np.newaxis] + bottom * frac[:, np.newaxis])
+        amplitude /= 2
+    tile -= tile.min()
+    if tile.max() > 0:
+        tile /= tile.max()
+    tile = tile.astype(np.float32)
+    tile.flags.writeable = False
+    return tile
+
+
+def noise_lookup(tile, shape, zoom=1., offset=(0, 0)):
+    """
+    Cover an image with a tileable noise tile (see noise_tile()), repeating it as needed, with bilinear
+    interpolation. Only 1-D index arrays are computed, so this costs a few gathers whatever the zoom; scroll the
+    noise by changing offset instead of making a new tile.
+    :param tile: square tileable float array
+    :param shape: (n rows, n columns) to cover
+    :param zoom: image pixels per tile pixel, or (rows zoom, columns zoom) to stretch the noise
+    :param offset: (rows, columns) in tile pixels to scroll the noise by
+    :return: float32 array of shape
+    """
+    size = tile.shape[0]
+    zoom_rows, zoom_cols = (zoom, zoom) if np.isscalar(zoom) else zoom
+
+    def axis_samples(n, axis_zoom, axis_offset):
+        pos = np.arange(n) / axis_zoom + axis_offset
+        cells = np.floor(pos).astype(np.intp)
+        frac = (pos - cells).astype(np.float32)
+        return cells % size, (cells + 1) % size, frac
+
+    rows, next_rows, row_frac = axis_samples(shape[0], zoom_rows, offset[0])
+    cols, next_cols, col_frac = axis_samples(shape[1], zoom_cols, offset[1])
+    top = tile[np.ix_(rows, cols)] * (1 - col_frac) + tile[np.ix_(rows, next_cols)] * col_frac
+    bottom = tile[np.ix_(next_rows, cols)] * (1 - col_frac) + tile[np.ix_(next_rows, next_cols)] * col_frac
+    return top * (1 - row_frac)[:, np.newaxis] + bottom * row_frac[:, np.newaxis]
+
+
 def scale(val, min_val, max_val, scale_min=0, scale_max=1):
     """
     Scale value on the scale min_val to max_val to the new scale scale_min to scale_max.
@@ -63,6 +750,54 @@ def scale(val, min_val, max_val, scale_min=0, scale_max=1):
     return (val * (scale_max - scale_min)) / (max_val - min_val)
 
 
+def polygon_mask(poly, x_min, x_max, y_min, y_max):
+    """
+    Rasterize a shapely polygon into a boolean mask over the pixel box [x_min, x_max) x [y_min, y_max), where x is
+    the first array axis and y the second (same as the polygon coordinates). Uses the even-odd rule: for every edge
+    of every ring, each row of pixels the edge crosses flips from outside to inside past the crossing point.
+    :return: boolean array of shape (x_max - x_min, y_max - y_min)
+    """
+    xs = np.arange(x_min, x_max, dtype=float)[:, np.newaxis]
+    ys = np.arange(y_min, y_max, dtype=float)
+    mask = np.zeros((len(xs), len(ys)), dtype=bool)
+    rings = [poly.exterior, *poly.interiors]
+    for ring in rings:
+        coords = np.asarray(ring.coords)
+        x1, y1 = coords[:-1, 0], coords[:-1, 1]
+        x2, y2 = coords[1:, 0], coords[1:, 1]
+        for ex1, ey1, ex2, ey2 in zip(x1, y1, x2, y2):
+            # which pixel columns (y values) does this edge span (half-open so shared vertices count once)
+            spans = (ey1 > ys) != (ey2 > ys)
+            if not spans.any():
+                continue
+            # x value where the edge crosses each spanned y
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x_cross = ex1 + (ys - ey1) * (ex2 - ex1) / (ey2 - ey1)
+            mask ^= spans & (xs < x_cross)
+    return mask
+
+
+def rasterize_polygons(polygons, width, height):
+    """
+    Rasterize many shapely polygons at once into one integer label map.
+    :param polygons: list of shapely polygons, in pixel coordinates
+    :param width: size of first array axis
+    :param height: size of second array axis
+    :return: int array of shape (width, height) holding the index of the polygon each pixel falls in, -1 if none
+    """
+    labels = np.full((width, height), -1, dtype=np.int32)
+    for i, poly in enumerate(polygons):
+        # only rasterize within the polygon's bounding box (clipped to the image)
+        b_x_min, b_y_min, b_x_max, b_y_max = poly.bounds
+        x_min, y_min = max(0, int(np.floor(b_x_min))), max(0, int(np.floor(b_y_min)))
+        x_max, y_max = min(width, int(np.ceil(b_x_max)) + 1), min(height, int(np.ceil(b_y_max)) + 1)
+        if x_min >= x_max or y_min >= y_max:
+            continue
+        mask = polygon_mask(poly, x_min, x_max, y_min, y_max)
+        labels[x_min:x_max, y_min:y_max][mask] = i
+    return labels
+
+
 def debug_pixel_arr(arr):
     img = array_to_img(arr)
     img.show()
@@ -85,7 +820,7 @@ def empty_alpha(size, return_img=False):
     :param arr:
     :return:
     """
-    new = np.empty([size[0], size[1], 4])
+    new = np.zeros([size[0], size[1], 4])
     if return_img:
         new = array_to_img_rgba(new)
     return new
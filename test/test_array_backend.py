@@ -0,0 +1,29 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress, keeping the image as a numpy array instead of a Pillow image
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_array_backend.png',
+    backend='array'
+)
+width, height = sorc.img.size
+
+# numpy-based effects change sorc.arr in place, no Pillow conversions in between
+sorc.neon(offset=50)
+sorc.cleave(
+    center_point=(width//2, height//2),
+    pixel_shift=25,
+    angle=30
+)
+sorc.static(amount=0.05)
+
+# the Pillow image is only made here, to save it
+sorc.save()
+
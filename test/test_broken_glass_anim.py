@@ -0,0 +1,34 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_broken_glass_anim/test_broken_glass_anim.png'
+)
+
+# shatter the image once and animate the pieces falling away
+sorc.broken_glass_frames(
+    n_frames=20,
+    n_fractures=10,
+    bend_chance=0.5,
+    max_bend_strength=100,
+    max_rand_piece_rotation=45,
+    max_drift=50,
+    easing=jinx.easings.ease_in_quad,  # ease in to give the effect of gravity
+    include_original=True
+)
+
+
+gm = jinx.GifMaker(
+    images_folder='test/out/test_broken_glass_anim',
+    out_path='test_broken_glass_anim.gif',
+    ms_between_frames=50
+)
+gm.draw()
+
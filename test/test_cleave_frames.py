@@ -0,0 +1,35 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+# misc for this example
+import numpy as np
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_cleave_frames/test_cleave_frames.png'
+)
+width, height = sorc.img.size
+
+# batch version of test_cleave.py: one frame per angle, each cleaved from the same original image, so there's no
+# need to reload() between frames (and the transparent background of the eye is kept)
+sorc.cleave_frames(
+    angles=np.arange(0, 370, 10),
+    center_point=(width//2, height//2),
+    move_chunk=1,
+    pixel_shift=50
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_cleave_frames',
+    out_path='test_cleave_frames.gif',
+    ms_between_frames=500
+)
+gm.draw()
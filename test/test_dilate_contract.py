@@ -4,6 +4,7 @@ import sys
 sys.path.append('src')
 # needed in installed version
 import jinx
+import numpy as np
 jinx.Jinx.set_out_folder('test/out')
 
 
@@ -14,6 +15,24 @@ sorc = jinx.Sorceress(
     out_path='test_dilate_contract/test_dilate_contract.png'
 )
 
+# the pupil: dark pixels near the middle of the eye (without a region, every dark pixel would count, background too)
+grayscale = np.array(sorc.get_grayscale())
+rows, cols = np.indices(grayscale.shape)
+pupil = (grayscale <= 20) & (np.hypot(rows - grayscale.shape[0] / 2, cols - grayscale.shape[1] / 2) < 36)
+
+# dilate the pupil out and back again
+sorc.dilate_contract_frames(
+    n_frames=30,
+    amount=30,
+    region=pupil,
+    shape='disk'
+)
 
-sorc.dilate_contract()
 
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_dilate_contract',
+    out_path='test_dilate_contract.gif',
+    ms_between_frames=50
+)
+gm.draw()
@@ -0,0 +1,26 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_font_frames/test_font_frames.png'
+)
+
+# stamp a caption and a frame counter onto copies of the image. The caption is the same on every frame, so it is only
+# rendered once and pasted after that
+items = []
+for frame_n in range(10):
+    items.append((None, 'THIS IS MY TEXT!!', (100, 100)))
+frames = sorc.text_frames(items, size=30, save=False)
+sorc.text_frames(
+    [(frame, f'frame {frame_n}', (100, 150)) for frame_n, frame in enumerate(frames)],
+    size=30
+)
+
@@ -0,0 +1,34 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_glare/test_glare.png'
+)
+
+
+# 4 blue lights orbiting the eye in a loop
+sorc.glare_frames(
+    n_frames=30,
+    n_lights=4,
+    ring_radius=120,
+    light_radius=90,
+    easing=jinx.easings.ease_in_cubic,
+    color=jinx.colors.NEON_BLUE,
+    intensity=1
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_glare',
+    out_path='test_glare.gif',
+    ms_between_frames=50
+)
+gm.draw()
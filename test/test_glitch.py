@@ -0,0 +1,32 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_glitch/test_glitch.png'
+)
+
+# glitch the image a different way every frame; the same seed always gives the same frames
+sorc.glitch_frames(
+    n_frames=20,
+    channel_shift=15,
+    n_blocks=10,
+    block_shift=80,
+    seed=0
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_glitch',
+    out_path='PHOTOSENSITIVE WARNING-test_glitch.gif',
+    ms_between_frames=80
+)
+gm.draw()
@@ -0,0 +1,46 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_gradient/test_gradient.png'
+)
+
+# one frame per kind of gradient
+for kind, blend in [('linear', 'normal'), ('radial', 'multiply'), ('angular', 'overlay')]:
+    sorc.gradient(
+        kind=kind,
+        start_color=jinx.colors.NEON_PINK,
+        end_color=jinx.colors.NEON_BLUE,
+        easing=jinx.easings.ease_in_out_sine,
+        blend=blend,
+        opacity=0.8,
+        angle=30
+    )
+    sorc.save_frame()
+    sorc.reload()
+
+# fade a screen-blended gradient in
+sorc.gradient_frames(
+    n_frames=10,
+    start_color=jinx.colors.NEON_PURPLE,
+    end_color=jinx.colors.WHITE,
+    blend='screen',
+    opacity=0.9,
+    angle=90
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_gradient',
+    out_path='test_gradient.gif',
+    ms_between_frames=200
+)
+gm.draw()
@@ -0,0 +1,29 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_kuwahara/test_kuwahara.png'
+)
+
+# paint the image with bigger and bigger brush strokes
+for radius in [1, 2, 4, 8, 16]:
+    sorc.kuwahara(radius=radius)
+    sorc.save_frame()
+    sorc.reload()
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_kuwahara',
+    out_path='test_kuwahara.gif',
+    ms_between_frames=300
+)
+gm.draw()
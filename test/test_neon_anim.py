@@ -0,0 +1,30 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_neon_anim/test_neon_anim.png'
+)
+
+# animate the neon glow: edges are found once, only the neon color offsets change each frame
+sorc.neon_frames(
+    n_frames=20,
+    offset=50
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_neon_anim',
+    out_path='test_neon_anim.gif',
+    ms_between_frames=60
+)
+gm.draw()
+
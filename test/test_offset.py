@@ -0,0 +1,35 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_offset/test_offset.png',
+    backend='array'
+)
+
+# only paint over a band through the middle of the image: effects inside region() only work on the band
+with sorc.region(rect=(800, 0, 1300, 2100)) as band:
+    band.kuwahara(radius=4)
+    band.gradient(kind='linear', end_color=jinx.colors.WHITE, blend='screen', opacity=0.4)
+
+# scroll the band sideways, once all the way around
+sorc.offset_frames(
+    n_frames=30,
+    rect=(800, 0, 1300, 2100)
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_offset',
+    out_path='test_offset.gif',
+    ms_between_frames=50
+)
+gm.draw()
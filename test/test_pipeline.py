@@ -0,0 +1,44 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_pipeline.png'
+)
+width, height = sorc.img.size
+
+# chain effects lazily; nothing runs until the pipeline is rendered (here, by saving), and then all effects run on
+# one pixel array
+sorc.pipeline().neon(
+    offset=50
+).cleave(
+    center_point=(width//2, height//2),
+    move_chunk=0,
+    pixel_shift=25,
+    angle=30
+).static(
+    amount=0.05
+).alpha_border(
+    gradient_easing=jinx.easings.ease_in_quint
+).save()
+
+
+# RGBA image with a transparent background: text drawn over transparent pixels makes them opaque, the same as
+# running the steps one at a time
+eye_sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_pipeline_rgba.png'
+)
+eye_sorc.pipeline().alpha_border().text(
+    text='JINX',
+    size=90,
+    loc=(10, 10),
+    color=jinx.colors.WHITE
+).save()
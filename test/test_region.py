@@ -0,0 +1,32 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+import numpy as np
+jinx.Jinx.set_out_folder('test/out')
+
+rect = (100, 100, 270, 270)
+for backend in ['array', 'pil']:
+    # define the image sorceress
+    sorc = jinx.Sorceress(
+        img_path='test/assets/jinx-test/eye.png',
+        out_path=f'test_region/test_region_{backend}.png',
+        backend=backend
+    )
+    before = sorc.arr.copy()
+
+    # rose_petal() works on the Pillow image and sets sorc.img, which inside region() lands in the region
+    with sorc.region(rect=rect) as sub:
+        sub.rose_petal(seed=3)
+
+    # only the region changed
+    after = sorc.arr.copy()
+    inside = (slice(rect[0], rect[2]), slice(rect[1], rect[3]))
+    if np.array_equal(after[inside], before[inside]):
+        raise Exception(f"Error: rose_petal() inside region() left the region unchanged ({backend} backend).")
+    after[inside] = before[inside]
+    if not np.array_equal(after, before):
+        raise Exception(f"Error: rose_petal() inside region() changed pixels outside it ({backend} backend).")
+    sorc.save()
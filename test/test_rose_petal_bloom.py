@@ -0,0 +1,37 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_rose_petal_bloom/test_rose_petal_bloom.png'
+)
+
+# bloom the rose from the inside out, saving a frame after each petal is pasted
+sorc.rose_petal_frames(
+    frame_per_petal=True,
+    n_rings=5,
+    paste_order=1,
+    ring_radius=50,
+    petal_center_noise=10,
+    n_petals_per_ring=15,
+    rand_rotation=360,
+    expansion_rate=2.0,
+    blur_gradient_easing=jinx.easings.ease_in_quint
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_rose_petal_bloom',
+    out_path='test_rose_petal_bloom.gif',
+    ms_between_frames=30
+)
+gm.draw()
+
@@ -0,0 +1,42 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+# define the image sorceresses
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_scuff/test_scuff.png'
+)
+banner_sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_banner/test_banner.png'
+)
+
+
+# grimy eye with scratches running down it like an old film
+sorc.scuff_frames(
+    n_frames=20,
+    amount=0.6,
+    seed=0
+)
+
+# logo waving like a banner in the wind
+banner_sorc.banner_frames(
+    n_frames=20,
+    amount=0.4,
+    fold_scale=4
+)
+
+
+# turn output into gifs
+for name in ['test_scuff', 'test_banner']:
+    gm = jinx.GifMaker(
+        images_folder=f'test/out/{name}',
+        out_path=f'{name}.gif',
+        ms_between_frames=60
+    )
+    gm.draw()
@@ -13,5 +13,19 @@ sorc = jinx.Sorceress(
 )
 
 
+# wrap the eye around a ring 4 times, and send the pieces slithering around it in a loop
+sorc.snake_frames(
+    n_frames=30,
+    ring_inner_radius=90,
+    ring_outer_radius=180,
+    n_pieces=4
+)
+
 
-sorc.snake()
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_snake',
+    out_path='test_snake.gif',
+    ms_between_frames=50
+)
+gm.draw()
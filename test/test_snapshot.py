@@ -0,0 +1,42 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+from PIL import Image
+jinx.Jinx.set_out_folder('test/out')
+
+# define the image sorceress from a Pillow image (reload() works for these too)
+sorc = jinx.Sorceress(
+    img=Image.open('test/assets/jinx-test/logo.png'),
+    out_path='test_snapshot/test_snapshot.png',
+    backend='array'
+)
+
+# glow once, then checkpoint the glowing image in memory
+sorc.neon(offset=50)
+sorc.snapshot()
+
+# each frame starts over from the checkpoint, without reading the image file again
+for i in range(30):
+    sorc.static(
+        amount=0.10,
+        pixel_colors=[jinx.colors.WHITE, jinx.colors.BLACK],
+        seed=i
+    )
+    sorc.save_frame()
+    sorc.restore()
+
+# back to the original image, before the glow
+sorc.reload()
+sorc.save_frame()
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_snapshot',
+    out_path='test_snapshot.gif',
+    ms_between_frames=30
+)
+gm.draw()
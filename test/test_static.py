@@ -43,3 +43,13 @@ sorc.static(
 sorc.save_frame()
 sorc.reload()
 
+
+# seed the static to get the exact same static every time the script is run
+sorc.static(
+    amount=0.20,
+    pixel_colors=[jinx.colors.WHITE, jinx.colors.NEON_BLUE, jinx.colors.NEON_YELLOW],
+    n_fuzzies=5,
+    seed=42
+)
+sorc.save_frame()
+sorc.reload()
@@ -0,0 +1,30 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_stereogram/test_stereogram.png'
+)
+
+
+# red-cyan 3D glasses, from one image slid apart by 8 pixels, shaking back and forth
+sorc.stereogram_frames(
+    n_frames=20,
+    shake=6,
+    shift=8
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_stereogram',
+    out_path='test_stereogram.gif',
+    ms_between_frames=50
+)
+gm.draw()
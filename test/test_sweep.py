@@ -0,0 +1,41 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# effects for one frame; defined at the top level so worker processes can load it
+def cleave_frame(sorc, angle, seed):
+    sorc.neon(offset=50)
+    sorc.static(amount=0.05, seed=seed)
+    w, h = sorc.img.size
+    sorc.cleave(center_point=(w//2, h//2), pixel_shift=25, angle=angle)
+    return
+
+
+# worker processes re-import this script, so only run the sweep from the main process
+if __name__ == '__main__':
+    # define the image sorceress
+    sorc = jinx.Sorceress(
+        img_path='test/assets/jinx-test/logo.png',
+        out_path='test_sweep/test_sweep.png'
+    )
+
+    # one frame per cleave angle, rendered across 4 processes and saved in angle order
+    sorc.sweep(
+        cleave_frame,
+        params=range(0, 370, 10),
+        workers=4,
+        seed=0
+    )
+
+    # turn output into gif
+    gm = jinx.GifMaker(
+        images_folder='test/out/test_sweep',
+        out_path='test_sweep.gif',
+        ms_between_frames=60
+    )
+    gm.draw()
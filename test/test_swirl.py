@@ -0,0 +1,30 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/logo.png',
+    out_path='test_swirl/test_swirl.png'
+)
+
+# swirl tighter and tighter, easing the strength in and out
+sorc.swirl_frames(
+    n_frames=30,
+    strength=8,
+    easing=jinx.easings.ease_in_out_sine
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_swirl',
+    out_path='test_swirl.gif',
+    ms_between_frames=50
+)
+gm.draw()
@@ -0,0 +1,31 @@
+# not needed in installed version
+# run from root project folder
+import sys
+sys.path.append('src')
+# needed in installed version
+import jinx
+jinx.Jinx.set_out_folder('test/out')
+
+# define the image sorceress
+sorc = jinx.Sorceress(
+    img_path='test/assets/jinx-test/eye.png',
+    out_path='test_tree/test_tree.png'
+)
+
+
+# grow a tree over the eye, drawing 5 growth steps per frame
+sorc.tree_frames(
+    steps_per_frame=5,
+    n_attractors=3000,
+    color=jinx.colors.NEON_PINK,
+    seed=0
+)
+
+
+# turn output into gif
+gm = jinx.GifMaker(
+    images_folder='test/out/test_tree',
+    out_path='test_tree.gif',
+    ms_between_frames=50
+)
+gm.draw()